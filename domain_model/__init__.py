@@ -6,18 +6,28 @@ attributes.
 """
 
 # imports to make easy access possible after importing domain_model
-from .activity import Activity, activity_from_json
+from .activity import Activity, activity_from_json, get_states, use_model_parameters
 from .activity_category import ActivityCategory, activity_category_from_json
 from .actor import Actor, EgoVehicle, actor_from_json
 from .actor_category import ActorCategory, ActorType, actor_category_from_json
+from .category_lattice import CategoryLattice, category_lattice_from_json
+from .collision import ProximityReport, detect_proximity
+from .derived_tags import DerivedTags, derived_tags_from_json
 from .document_management import DocumentManagement
 from .event import Event, event_from_json
+from .event_resolution import resolve_event, resolve_events
+from .metrics import SafetyMetrics, safety_metrics, safety_metrics_database
 from .model import Constant, Linear, Spline3Knots, Sinusoidal, Splines, model_from_json, Messages
+from .model_parameters import ModelParameters
 from .physical_element import PhysicalElement, physical_element_from_json
 from .physical_element_category import PhysicalElementCategory, physical_element_category_from_json
+from .result_cache import ResultCache
 from .scenario import Scenario, scenario_from_json
-from .scenario_category import ScenarioCategory, scenario_category_from_json
+from .scenario_category import ScenarioCategory, classify, includes_matrix, \
+    scenario_category_from_json
 from .scenario_element import DMObjects, get_empty_dm_object
 from .state import State, state_from_json
 from .state_variable import StateVariable, state_variable_from_json
-from .tags import Tag, tag_from_json
+from .tags import Tag, TagSet, tag_from_json, tag_set_from_json
+from .trajectory_cache import TrajectoryCache, disable_trajectory_cache, enable_trajectory_cache, \
+    get_trajectory_cache
@@ -18,19 +18,33 @@ Modifications:
 2020 08 24: Add functionality to obtain the values of the state variables (and the derivative).
 2020 10 05: Change way of creating object from JSON code.
 2020 10 29: Add plot functionality.
+2026 10 16: Keep track of changes of the category, such that derived tags can be cached.
+2026 10 16: Add get_state_chunks() for evaluating long activities with bounded memory.
+2026 10 16: Keep track of changes of the parameters, such that evaluated states can be cached.
+2026 10 16: Add get_states() for evaluating many activities at once.
+2026 10 16: Add get_state_integral() for evaluating the integral of the state.
+2026 10 16: Keep track of changes of the parameters, such that resolved events are updated.
+2026 10 16: Accept parameters that are stored in an array (see use_model_parameters()).
 """
 
-from typing import List, Union
+from itertools import count
+from typing import Dict, Hashable, Iterator, List, Tuple, Union
 from matplotlib.axes import Axes
 import matplotlib.pyplot as plt
 import numpy as np
 from .activity_category import ActivityCategory, _activity_category_from_json
 from .event import Event
-from .scenario_element import DMObjects, _object_from_json, _attributes_from_json
+from .model_parameters import ModelParameters
+from .scenario_element import DMObjects, _object_from_json, _attributes_from_json, _notifying
 from .time_interval import TimeInterval, _time_interval_props_from_json
+from .trajectory_cache import get_trajectory_cache, _grid_fingerprint
 from .type_checking import check_for_type
 
 
+# Each change of the parameters of any activity results in a new (unique) version.
+_PARAMETERS_VERSIONS = count()
+
+
 class Activity(TimeInterval):
     """ Activity
 
@@ -47,17 +61,66 @@ class Activity(TimeInterval):
         end (Event): The end event.
         category(ActivityCategory): The category of the activity
             defines the state and the model.
-        parameters(dict): A dictionary of the parameters that quantifies the
-            activity.
+        parameters(Union[dict, ModelParameters]): The parameters that quantifies the
+            activity. Changes of the parameters, either by setting the
+            parameters or by using the methods of the dictionary, are tracked,
+            such that evaluated states can be cached (see TrajectoryCache).
+            Setting the parameters with a dictionary makes a copy of it, so
+            later changes of the original dictionary do not change the
+            parameters of the activity; use activity.parameters instead.
+            The parameters can also be ModelParameters, which are not copied
+            unless they already belong to another activity.
     """
-    def __init__(self, category: ActivityCategory, parameters: dict, **kwargs):
+    def __init__(self, category: ActivityCategory, parameters: Union[dict, ModelParameters],
+                 **kwargs):
         # Check the types of the inputs
         check_for_type("activity_category", category, ActivityCategory)
-        check_for_type("parameters", parameters, dict)
+        check_for_type("parameters", parameters, (dict, ModelParameters))
 
         TimeInterval.__init__(self, **kwargs)
-        self.category = category  # type: ActivityCategory
-        self.parameters = parameters  # type: dict
+        self.category = category
+        self.parameters = parameters  # type: Union[dict, ModelParameters]
+
+    @property
+    def category(self) -> ActivityCategory:
+        """ The category of the activity. """
+        return self._category
+
+    @category.setter
+    def category(self, category: ActivityCategory) -> None:
+        self._category = category
+        self._observe([category])
+        self._changed()
+
+    @property
+    def parameters(self) -> Union[dict, ModelParameters]:
+        """ The parameters of the activity. """
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, parameters: Union[dict, ModelParameters]) -> None:
+        # pylint: disable=protected-access
+        if isinstance(getattr(self, "_parameters", None), ModelParameters):
+            self._parameters._owner = None
+        if isinstance(parameters, ModelParameters):
+            if parameters._owner is not None:
+                parameters = parameters.copy()
+            parameters._owner = self
+            self._parameters = parameters
+        else:
+            self._parameters = _ParameterDict(self, parameters)
+        self._parameters_changed()
+
+    def _parameters_changed(self) -> None:
+        self._parameters_version = next(_PARAMETERS_VERSIONS)
+        self._changed()
+
+    def __setstate__(self, state: dict) -> None:
+        TimeInterval.__setstate__(self, state)
+        if isinstance(self._parameters, ModelParameters):
+            self._parameters._owner = self
+        else:
+            self._parameters = _ParameterDict(self, self._parameters)
 
     def get_state(self, npoints: int = 100, time: Union[np.ndarray, float, List] = None) \
             -> np.ndarray:
@@ -72,8 +135,7 @@ class Activity(TimeInterval):
         :param time: Time instance(s) at which the model is to be evaluated.
         :return: Numpy array with the state.
         """
-        return self.category.model.get_state(self.parameters,
-                                             self._get_time(npoints, time))
+        return self._cached_state(npoints, time, derivative=False)
 
     def get_state_dot(self, npoints: int = 100, time: Union[np.ndarray, float, List] = None) \
             -> np.ndarray:
@@ -88,6 +150,51 @@ class Activity(TimeInterval):
         :param time: Time instance(s) at which the model is to be evaluated.
         :return: Numpy array with the state.
         """
+        return self._cached_state(npoints, time, derivative=True)
+
+    def get_state_integral(self, npoints: int = 100,
+                           time: Union[np.ndarray, float, List] = None) -> np.ndarray:
+        """ Obtain the integral of the state from the start of the activity.
+
+        The integral is computed analytically using the model (see
+        Model.get_state_integral()), so no fine grid of time instances is
+        needed. For example, the integral of the speed is the travelled
+        distance since the start of the activity. If the start time or the end
+        time of the activity is not known, the integral is not scaled with the
+        duration of the activity.
+
+        :param npoints: Number of points for evaluating the integral.
+        :param time: Time instance(s) at which the integral is to be evaluated.
+        :return: Numpy array with the integral of the state.
+        """
+        integral = self.category.model.get_state_integral(self.parameters,
+                                                          self._get_time(npoints, time))
+        duration = self.get_duration()
+        if duration is not None:
+            return integral * duration
+        return integral
+
+    def _cached_state(self, npoints: int, time: Union[np.ndarray, float, List, None],
+                      derivative: bool) -> np.ndarray:
+        cache = get_trajectory_cache()
+        if cache is None:
+            return self._evaluate(npoints, time, derivative)
+        key = ("activity", derivative, _grid_fingerprint(time, npoints)) + self._cache_key()
+        return cache.get(key, lambda: self._evaluate(npoints, time, derivative))
+
+    def _cache_key(self) -> tuple:
+        """ Return everything (apart from the time instants) that determines the state.
+
+        :return: Tuple that can be used for caching the evaluated state.
+        """
+        return (self.uid, self._parameters_version, self.category.uid, self.category.model.uid,
+                self.get_tstart(), self.get_tend())
+
+    def _evaluate(self, npoints: int, time: Union[np.ndarray, float, List, None],
+                  derivative: bool) -> np.ndarray:
+        if not derivative:
+            return self.category.model.get_state(self.parameters, self._get_time(npoints, time))
+
         state_dot = self.category.model.get_state_dot(self.parameters,
                                                       self._get_time(npoints, time))
         duration = self.get_duration()
@@ -95,6 +202,29 @@ class Activity(TimeInterval):
             return state_dot / duration
         return state_dot
 
+    def get_state_chunks(self, rate: float, tstart: float = None, tend: float = None,
+                         chunk_size: int = 10000, derivative: bool = False) \
+            -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """ Evaluate the state at equidistant time instants, in chunks.
+
+        For long activities, evaluating the state at a high rate results in
+        large arrays. Instead, this generator yields the time instants and the
+        values of the state in chunks of at most `chunk_size` time instants,
+        such that only one chunk is in memory at a time.
+
+        :param rate: Number of time instants per second.
+        :param tstart: The first time instant. By default, the start time.
+        :param tend: The last time instant. By default, the end time.
+        :param chunk_size: Maximum number of time instants per chunk.
+        :param derivative: Whether to evaluate the derivative of the state.
+        :return: Generator of tuples with the time instants and the values.
+        """
+        for time in self._time_chunks(rate, tstart=tstart, tend=tend, chunk_size=chunk_size):
+            if derivative:
+                yield time, self.get_state_dot(time=time)
+            else:
+                yield time, self.get_state(time=time)
+
     def _get_time(self, npoints: int = 100, time: Union[np.ndarray, float, List] = None) \
             -> np.ndarray:
         if time is None:
@@ -153,15 +283,126 @@ class Activity(TimeInterval):
         activity = TimeInterval.to_json(self)
         activity["category"] = dict(name=self.category.name,
                                     uid=self.category.uid)
-        activity["parameters"] = self.parameters
+        activity["parameters"] = self._parameters_to_json()
         return activity
 
     def to_json_full(self) -> dict:
         activity = TimeInterval.to_json_full(self)
         activity["category"] = self.category.to_json_full()
-        activity["parameters"] = self.parameters
+        activity["parameters"] = self._parameters_to_json()
         return activity
 
+    def _parameters_to_json(self) -> dict:
+        if isinstance(self.parameters, ModelParameters):
+            return self.parameters.to_json()
+        return self.parameters
+
+
+class _ParameterDict(dict):
+    """ Dictionary of parameters that notifies the activity that owns it when it is changed. """
+    def __init__(self, owner: Activity, parameters: dict):
+        dict.__init__(self, parameters)
+        self._owner = owner
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+for _method_name in ("__setitem__", "__delitem__", "__ior__", "clear", "pop", "popitem",
+                     "setdefault", "update"):
+    setattr(_ParameterDict, _method_name, _notifying(_method_name, base=dict,
+                                                     callback="_parameters_changed"))
+
+
+def get_states(activities: List[Activity], npoints: int = 100,
+               time: Union[np.ndarray, float, List] = None, derivative: bool = False) -> np.ndarray:
+    """ Obtain the states of multiple activities evaluated at the same time instances.
+
+    The result is the same as calling Activity.get_state() (or
+    Activity.get_state_dot() if `derivative` is True) for each activity, but
+    the activities are grouped by the type of their model and each group is
+    evaluated at once (see Model.get_state_batch()). This is much faster when
+    evaluating many activities, e.g., the activities of many scenarios.
+
+    :param activities: The activities that are to be evaluated.
+    :param npoints: Number of points for evaluating the states.
+    :param time: Time instance(s) at which the activities are to be evaluated.
+    :param derivative: Whether to evaluate the derivatives of the states.
+    :return: Numpy array with, for each activity, the state.
+    """
+    if not activities:
+        return np.zeros((0, npoints if time is None else np.size(time)))
+
+    groups = dict()  # type: Dict[Hashable, List[int]]
+    for i, activity in enumerate(activities):
+        model = activity.category.model
+        groups.setdefault(model._batch_group(), []).append(i)  # pylint: disable=protected-access
+
+    if time is not None:
+        # Scale the time for each activity, see Activity._get_time().
+        time = np.atleast_1d(np.asarray(time, dtype=float))
+        tstart, duration = _get_scaling(activities)
+        time = (time - tstart[:, np.newaxis]) / duration[:, np.newaxis]
+    elif derivative:
+        duration = _get_scaling(activities)[1]
+
+    result = None
+    for indices in groups.values():
+        model = activities[indices[0]].category.model
+        # If time is not provided, the normalized time is the same for all activities.
+        tdata = np.linspace(0, 1, npoints) if time is None else time[indices]
+        pars = [activities[i].parameters for i in indices]
+        if not derivative:
+            values = model.get_state_batch(pars, tdata)
+        else:
+            values = model.get_state_dot_batch(pars, tdata)
+            values /= duration[indices].reshape((len(indices),) + (1,)*(values.ndim-1))
+
+        if result is None:
+            result = np.zeros((len(activities),) + values.shape[1:])
+        elif values.shape[1:] != result.shape[1:]:
+            raise ValueError("The states of the activities do not have the same dimension.")
+        result[indices] = values
+    return result
+
+
+def use_model_parameters(activities: List[Activity]) -> None:
+    """ Store the parameters of the activities in arrays, see ModelParameters.
+
+    By default, the parameters of an activity are a dictionary, e.g., with lists
+    for the knots and the coefficients of splines. After using this function,
+    the parameters are ModelParameters, such that lists do not need to be
+    converted to arrays each time an activity is evaluated. ModelParameters
+    can be used like a dictionary, but they are not a dict; use
+    ModelParameters.to_json() to obtain a dictionary with lists. Parameters of
+    models without numerical parameters (e.g., Messages) remain a dictionary.
+
+    :param activities: The activities.
+    """
+    for activity in activities:
+        model = activity.category.model
+        if not isinstance(activity.parameters, ModelParameters) and \
+                model._parameter_fields(activity.parameters):  # pylint: disable=protected-access
+            activity.parameters = model.create_parameters(activity.parameters)
+
+
+def _get_scaling(activities: List[Activity]) -> Tuple[np.ndarray, np.ndarray]:
+    """ Return the start time and duration of each activity for scaling the time.
+
+    If the start time or end time of an activity is not known, the time is not
+    scaled, i.e., a start time of 0 and a duration of 1 are used.
+
+    :param activities: The activities.
+    :return: The start times and the durations.
+    """
+    scaling = np.zeros((len(activities), 2))
+    scaling[:, 1] = 1
+    for i, activity in enumerate(activities):
+        tstart, tend = activity.get_tstart(), activity.get_tend()
+        if tstart is not None and tend is not None:
+            scaling[i] = tstart, tend - tstart
+    return scaling[:, 0], scaling[:, 1]
+
 
 def _activity_props_from_json(json: dict, attribute_objects: DMObjects, start: Event = None,
                               end: Event = None, category: ActivityCategory = None) -> dict:
@@ -0,0 +1,170 @@
+""" Class CategoryLattice
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from typing import Dict, List, Set
+from .derived_tags import DerivedTags
+from .scenario_category import ScenarioCategory, _comprises_tags, _derived_tags_from_json
+from .type_checking import check_for_type
+
+
+class CategoryLattice:
+    """ CategoryLattice - the inclusion relations between scenario categories
+
+    A scenario category can include another scenario category, see
+    ScenarioCategory.includes(). The CategoryLattice stores these relations as
+    a directed acyclic graph, where each edge points from a scenario category
+    to a scenario category that it includes. Only the transitive reduction is
+    stored: if A includes B and B includes C, there is no edge from A to C.
+
+    If two scenario categories include each other, the scenario category that
+    is added first is regarded to include the other.
+
+    Because a scenario category that includes another scenario category also
+    comprises all scenarios that the other scenario category comprises, the
+    lattice can be used to classify a scenario efficiently: if a scenario is
+    not comprised by a scenario category, it is also not comprised by any of
+    the scenario categories below it. See classify().
+
+    Only the derived tags of the scenario categories are stored, so the
+    lattice can be stored as JSON code and read again without the need to
+    check all pairs of scenario categories again.
+
+    Attributes:
+        names (Dict[int, str]): The name of each scenario category.
+        children (Dict[int, Set[int]]): For each scenario category, the uids of
+            the scenario categories directly below it.
+        parents (Dict[int, Set[int]]): For each scenario category, the uids of
+            the scenario categories directly above it.
+    """
+    def __init__(self, scenario_categories: List[ScenarioCategory] = None):
+        self.names = dict()  # type: Dict[int, str]
+        self.children = dict()  # type: Dict[int, Set[int]]
+        self.parents = dict()  # type: Dict[int, Set[int]]
+        self._tags = dict()  # type: Dict[int, DerivedTags]
+        self._order = []  # type: List[int]
+        self._topological_order = None  # type: List[int]
+
+        if scenario_categories is not None:
+            for scenario_category in scenario_categories:
+                self.add(scenario_category)
+
+    def add(self, scenario_category: ScenarioCategory) -> None:
+        """ Add a scenario category to the lattice.
+
+        The scenario category is compared with all scenario categories of the
+        lattice. The existing relations are updated, such that only the
+        transitive reduction is stored.
+
+        :param scenario_category: The scenario category to be added.
+        """
+        check_for_type("scenario_category", scenario_category, ScenarioCategory)
+        self._add(scenario_category.uid, scenario_category.name,
+                  scenario_category.derived_tags())
+
+    def roots(self) -> List[int]:
+        """ Return the scenario categories that are not included by others.
+
+        :return: List with the uids of the most general scenario categories.
+        """
+        return [uid for uid in self._order if not self.parents[uid]]
+
+    def classify(self, scenario) -> List[int]:
+        """ Obtain the scenario categories that comprise the given scenario.
+
+        The scenario categories are checked from the most general to the most
+        specific ones. A scenario category is only checked if all scenario
+        categories directly above it comprise the scenario.
+
+        :param scenario: The scenario that is to be classified.
+        :return: List with the uids of the scenario categories that comprise
+            the scenario.
+        """
+        other_tags = scenario.derived_tags()
+        comprised = dict()
+        for uid in self._get_topological_order():
+            comprised[uid] = all(comprised[parent] for parent in self.parents[uid]) and \
+                _comprises_tags(self._tags[uid], other_tags)
+        return [uid for uid in self._order if comprised[uid]]
+
+    def to_json(self) -> dict:
+        """ Get JSON code of object.
+
+        :return: dictionary that can be converted to a json file.
+        """
+        return {"scenario_categories": [{"id": "{:d}".format(uid),
+                                         "name": self.names[uid],
+                                         "derived_tags": self._tags[uid].to_json()}
+                                        for uid in self._order],
+                "edges": [["{:d}".format(uid), "{:d}".format(child)]
+                          for uid in self._order for child in sorted(self.children[uid])]}
+
+    def _add(self, uid: int, name: str, tags: DerivedTags, parents: Set[int] = None,
+             children: Set[int] = None) -> None:
+        if uid in self.names:
+            raise ValueError("Scenario category with id {:d} is already in the ".format(uid) +
+                             "lattice.")
+
+        if parents is None or children is None:
+            # Determine all scenario categories above and below the new scenario category.
+            above = {other for other in self._order if _comprises_tags(self._tags[other], tags)}
+            below = {other for other in self._order
+                     if other not in above and _comprises_tags(tags, self._tags[other])}
+
+            # Only the nearest ones are directly connected to the new scenario category.
+            parents = {other for other in above if not self.children[other] & above}
+            children = {other for other in below if not self.parents[other] & below}
+
+            # Relations between the parents and children now go via the new scenario category.
+            for parent in parents:
+                for child in children & self.children[parent]:
+                    self.children[parent].discard(child)
+                    self.parents[child].discard(parent)
+
+        self.names[uid] = name
+        self._tags[uid] = tags
+        self._order.append(uid)
+        self.parents[uid] = set(parents)
+        self.children[uid] = set(children)
+        for parent in parents:
+            self.children[parent].add(uid)
+        for child in children:
+            self.parents[child].add(uid)
+        self._topological_order = None
+
+    def _get_topological_order(self) -> List[int]:
+        if self._topological_order is None:
+            n_parents = {uid: len(self.parents[uid]) for uid in self._order}
+            order = self.roots()
+            for uid in order:  # The order grows while iterating over it.
+                for child in self.children[uid]:
+                    n_parents[child] -= 1
+                    if not n_parents[child]:
+                        order.append(child)
+            self._topological_order = order
+        return self._topological_order
+
+
+def category_lattice_from_json(json: dict) -> CategoryLattice:
+    """ Get CategoryLattice object from JSON code
+
+    It is assumed that the JSON code of the CategoryLattice is created using
+    CategoryLattice.to_json(). The inclusion relations are not checked again.
+
+    :param json: JSON code of the CategoryLattice.
+    :return: CategoryLattice object.
+    """
+    lattice = CategoryLattice()
+    edges = [(int(parent), int(child)) for parent, child in json["edges"]]
+    for scenario_category in json["scenario_categories"]:
+        lattice._add(int(scenario_category["id"]),  # pylint: disable=protected-access
+                     scenario_category["name"], _derived_tags_from_json(scenario_category),
+                     parents=set(), children=set())
+    for parent, child in edges:
+        lattice.children[parent].add(child)
+        lattice.parents[child].add(parent)
+    return lattice
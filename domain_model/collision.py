@@ -0,0 +1,135 @@
+""" Class ProximityReport and functions for detecting collisions between actors
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from typing import List, Tuple
+import numpy as np
+from .actor import Actor
+from .metrics import _get_dimensions, _road_states
+from .scenario import Scenario
+from .type_checking import check_for_type
+
+
+class ProximityReport:
+    """ ProximityReport - the pairs of actors that come close to each other
+
+    For each pair of actors that come within the proximity distance of each
+    other (see detect_proximity()), the report contains the time of the first
+    contact (NaN if the actors do not collide), the minimum distance between
+    the actors, and the time at which this minimum distance occurs. The
+    distance is the distance between the boxes of the actors, so it is 0 if the
+    boxes touch or overlap. Pairs of actors that do not come within the
+    proximity distance are not part of the report.
+
+    Attributes:
+        pairs (List[Tuple[Actor, Actor]]): The pairs of actors.
+        first_contact (np.ndarray): For each pair, the time of the first
+            contact, or NaN if the actors do not collide.
+        min_distance (np.ndarray): For each pair, the minimum distance.
+        min_distance_time (np.ndarray): For each pair, the time of the minimum
+            distance.
+    """
+    def __init__(self, pairs: List[Tuple[Actor, Actor]], first_contact: np.ndarray,
+                 min_distance: np.ndarray, min_distance_time: np.ndarray):
+        self.pairs = pairs
+        self.first_contact = first_contact
+        self.min_distance = min_distance
+        self.min_distance_time = min_distance_time
+
+    def collides(self) -> bool:
+        """ Check whether any pair of actors collides.
+
+        :return: Whether there is at least one collision.
+        """
+        return bool(np.any(~np.isnan(self.first_contact)))
+
+    def get_collisions(self) -> List[Tuple[Actor, Actor, float]]:
+        """ Obtain the pairs of actors that collide, ordered by the time of first contact.
+
+        :return: List with, for each collision, both actors and the time of the
+            first contact.
+        """
+        return [(self.pairs[i][0], self.pairs[i][1], float(self.first_contact[i]))
+                for i in np.argsort(self.first_contact) if not np.isnan(self.first_contact[i])]
+
+
+def detect_proximity(scenario: Scenario, step: float = 0.1, tstart: float = None,
+                     tend: float = None, actors: List[Actor] = None,
+                     proximity: float = 0.) -> ProximityReport:
+    """ Detect collisions and near-collisions between the actors of a scenario.
+
+    Each actor is represented by a box in road coordinates, centered at the
+    longitudinal position and the lateral position of the actor, with the
+    length and width from its properties (see safety_metrics() for how the
+    positions and dimensions are obtained). The boxes are evaluated at
+    equidistant time instants.
+
+    Instead of comparing all pairs of actors at all time instants, a sort and
+    sweep is used: for all time instants at once, the boxes are sorted by their
+    rear end (enlarged by the proximity distance), such that only pairs of
+    actors that are close in longitudinal direction are candidates. Next, the
+    exact distance between the boxes is only computed for these candidates.
+
+    :param scenario: The scenario.
+    :param step: The time between two consecutive time instants.
+    :param tstart: The first time instant. By default, the start time.
+    :param tend: The last time instant. By default, the end time.
+    :param actors: The actors. By default, all actors of the scenario.
+    :param proximity: Pairs of actors that come within this distance of each
+        other are reported. By default, only collisions are reported.
+    :return: The report with the pairs of actors that come close.
+    """
+    check_for_type("scenario", scenario, Scenario)
+    if proximity < 0:
+        raise ValueError("Proximity should be nonnegative, but it is {}.".format(proximity))
+    time = scenario._time_grid(step, tstart, tend)  # pylint: disable=protected-access
+    actors = list(scenario.actors if actors is None else actors)
+
+    # Lower and upper bounds of the boxes, with shape (2, number of times, number of actors).
+    states = _road_states(scenario, time, actors)
+    half_size = _get_dimensions(actors) / 2
+    lower = (states[:, :2] - half_size[:, :, np.newaxis]).transpose(1, 2, 0)
+    upper = (states[:, :2] + half_size[:, :, np.newaxis]).transpose(1, 2, 0)
+
+    # Broad phase: sort and sweep along the longitudinal direction. The boxes are sorted by their
+    # rear end. The k-th next box is a candidate if it starts before the front end of the box.
+    # If this holds for none of the boxes, it does not hold for the (k+1)-th next boxes either.
+    order = np.argsort(lower[0], axis=1)
+    sorted_lower = np.take_along_axis(lower[0], order, axis=1)
+    sorted_upper = np.take_along_axis(upper[0], order, axis=1) + proximity
+    candidates = []
+    for offset in range(1, len(actors)):
+        overlap = sorted_lower[:, offset:] <= sorted_upper[:, :-offset]
+        if not np.any(overlap):
+            break
+        i_time, i_sorted = np.nonzero(overlap)
+        candidates.append((i_time, order[i_time, i_sorted], order[i_time, i_sorted + offset]))
+    if not candidates:
+        return ProximityReport([], np.zeros(0), np.zeros(0), np.zeros(0))
+    i_time, first, second = (np.concatenate(indices) for indices in zip(*candidates))
+    first, second = np.minimum(first, second), np.maximum(first, second)
+
+    # Narrow phase: the exact distance between the boxes.
+    gaps = np.maximum(np.maximum(lower[:, i_time, second] - upper[:, i_time, first],
+                                 lower[:, i_time, first] - upper[:, i_time, second]), 0)
+    distance = np.hypot(gaps[0], gaps[1])
+    close = distance <= proximity
+    i_time, first, second, distance = i_time[close], first[close], second[close], distance[close]
+
+    # Aggregate per pair of actors.
+    pairs, i_pair = np.unique(first * len(actors) + second, return_inverse=True)
+    first_contact = np.full(len(pairs), np.inf)
+    np.minimum.at(first_contact, i_pair[distance == 0], time[i_time[distance == 0]])
+    first_contact[np.isinf(first_contact)] = np.nan
+    min_distance = np.full(len(pairs), np.inf)
+    np.minimum.at(min_distance, i_pair, distance)
+    is_minimum = distance == min_distance[i_pair]
+    min_distance_time = np.full(len(pairs), np.inf)
+    np.minimum.at(min_distance_time, i_pair[is_minimum], time[i_time[is_minimum]])
+
+    return ProximityReport([(actors[pair // len(actors)], actors[pair % len(actors)])
+                            for pair in pairs], first_contact, min_distance, min_distance_time)
@@ -0,0 +1,167 @@
+""" Class DerivedTags
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+2026 10 16: Add fingerprint() for storing comparison results.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Tuple
+import hashlib
+from .tags import TagSet, tag_set_from_json
+
+
+# The class names that are used in the keys of the derived tags, for the own object, the actors,
+# and the physical elements, respectively.
+_QUANTITATIVE_CLASSES = ("Scenario", "Actor", "PhysicalElement")
+_QUALITATIVE_CLASSES = ("ScenarioCategory", "ActorCategory", "PhysicalElementCategory")
+
+
+class DerivedTags(Mapping):
+    """ The tags of a Scenario(Category), including the tags of its attributes.
+
+    The derived tags are divided into three groups: the tags of the
+    Scenario(Category) itself, the tags of each of the actors, and the tags of
+    each of the physical elements. The tags are stored as TagSet objects.
+
+    For comparing derived tags, see ScenarioCategory.comprises(), the groups
+    are used directly. To obtain the integers that are used for these
+    comparisons, use encode().
+
+    DerivedTags can also be used as a (read-only) dictionary. Each key is
+    formatted as <name>::<class>, where <class> is, e.g., "ActorCategory" or
+    "Actor". If multiple objects of the same class have the same name, a number
+    is appended to the name. The dictionary is only created when it is used,
+    e.g., when converting the derived tags to JSON code.
+
+    Attributes:
+        name (str): The name of the Scenario(Category).
+        own (TagSet): The tags of the Scenario(Category) itself.
+        actors (Tuple[Tuple[str, TagSet], ...]): The name and tags of each
+            actor, including the tags of the activities of the actor.
+        physical_elements (Tuple[Tuple[str, TagSet], ...]): The name and tags of
+            each physical element.
+        qualitative (bool): Whether the tags belong to a ScenarioCategory
+            (True) or a Scenario (False).
+    """
+    __slots__ = ("name", "own", "actors", "physical_elements", "qualitative", "_dict", "_encoded",
+                 "_fingerprint")
+
+    def __init__(self, name: str = "", own: TagSet = None,
+                 actors: Iterable[Tuple[str, TagSet]] = (),
+                 physical_elements: Iterable[Tuple[str, TagSet]] = (), qualitative: bool = False):
+        self.name = name  # type: str
+        self.own = TagSet() if own is None else own  # type: TagSet
+        self.actors = tuple(actors)  # type: Tuple[Tuple[str, TagSet], ...]
+        self.physical_elements = tuple(physical_elements)  # type: Tuple[Tuple[str, TagSet], ...]
+        self.qualitative = qualitative  # type: bool
+        self._dict = None
+        self._encoded = None
+        self._fingerprint = None
+
+    def encode(self) -> tuple:
+        """ Encode the derived tags with integers.
+
+        The encoding is a tuple with three items: the tags of the
+        Scenario(Category) itself, a tuple with the tags of each of the actors,
+        and a tuple with the tags of each of the physical elements. Each tags
+        are encoded by the tuple (mask, closure), see TagSet.
+
+        :return: The encoded tags.
+        """
+        if self._encoded is None:
+            self._encoded = ((self.own.mask, self.own.closure()),
+                             tuple((tags.mask, tags.closure()) for _, tags in self.actors),
+                             tuple((tags.mask, tags.closure())
+                                   for _, tags in self.physical_elements))
+        return self._encoded
+
+    def fingerprint(self) -> str:
+        """ Return a hash of the tags that does not depend on the names.
+
+        Two DerivedTags with the same fingerprint are equal when comparing them
+        with other derived tags (see ScenarioCategory.comprises()), as long as
+        the Tag enumeration is not changed. The order of the actors and the
+        order of the physical elements do not matter.
+
+        :return: Hexadecimal string with the hash.
+        """
+        if self._fingerprint is None:
+            content = [[tag.name for tag in self.own],
+                       sorted([tag.name for tag in tags] for _, tags in self.actors),
+                       sorted([tag.name for tag in tags] for _, tags in self.physical_elements)]
+            self._fingerprint = hashlib.sha1(repr(content).encode()).hexdigest()
+        return self._fingerprint
+
+    def all_tags(self) -> TagSet:
+        """ Return the tags of all groups together.
+
+        :return: TagSet with all tags.
+        """
+        mask = self.own.mask
+        for _, tags in self.actors + self.physical_elements:
+            mask |= tags.mask
+        return TagSet(mask=mask)
+
+    def to_json(self) -> Dict[str, List[str]]:
+        """ When the DerivedTags are exporting to JSON, this function is being called
+
+        :return: Dictionary with, for each key, a list with the names of the tags.
+        """
+        return {key: tags.to_json() for key, tags in self.items()}
+
+    def _get_dict(self) -> Dict[str, TagSet]:
+        if self._dict is None:
+            classes = _QUALITATIVE_CLASSES if self.qualitative else _QUANTITATIVE_CLASSES
+            tags = dict()
+            if self.own:
+                tags["{:s}::{:s}".format(self.name, classes[0])] = self.own
+            for class_name, group in zip(classes[1:], (self.actors, self.physical_elements)):
+                for name, object_tags in group:
+                    key = "{:s}::{:s}".format(name, class_name)
+                    i = 1
+                    while key in tags:  # Make sure that a unique key is used.
+                        i += 1
+                        key = "{:s}{:d}::{:s}".format(name, i, class_name)
+                    tags[key] = object_tags
+            self._dict = tags
+        return self._dict
+
+    def __getitem__(self, key: str) -> TagSet:
+        return self._get_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_dict())
+
+    def __len__(self) -> int:
+        return len(self._get_dict())
+
+    def __repr__(self) -> str:
+        return repr(self._get_dict())
+
+
+def derived_tags_from_json(json: Dict[str, List[str]]) -> DerivedTags:
+    """ Get DerivedTags object from JSON code
+
+    It is assumed that the JSON code is created using DerivedTags.to_json(),
+    i.e., each key is formatted as <name>::<class>.
+
+    :param json: JSON code of the derived tags.
+    :return: DerivedTags object.
+    """
+    name, own, groups, qualitative = "", None, ([], []), False
+    for key, tags in json.items():
+        object_name, class_name = key.rsplit("::", 1)
+        qualitative = class_name in _QUALITATIVE_CLASSES
+        classes = _QUALITATIVE_CLASSES if qualitative else _QUANTITATIVE_CLASSES
+        if class_name not in classes:
+            raise ValueError("Class '{:s}' of derived tags '{:s}' is unknown.".format(class_name,
+                                                                                      key))
+        if class_name == classes[0]:
+            name, own = object_name, tag_set_from_json(tags)
+        else:
+            groups[classes.index(class_name) - 1].append((object_name, tag_set_from_json(tags)))
+    return DerivedTags(name, own, actors=groups[0], physical_elements=groups[1],
+                       qualitative=qualitative)
@@ -6,21 +6,31 @@ Author(s): Erwin de Gelder
 Modifications:
 2020 11 01: Update class based on the update of the domain model.
 2020 11 06: Add option of also adding attributes to the database.
+2026 10 16: Add count_tags() for counting the items per tag, including the subtags.
+2026 10 16: Add an inverted tag index for finding the scenarios that a scenario category comprises.
+2026 10 16: Add a membership table that is updated when scenarios (categories) are added/deleted.
+2026 10 16: Add get_result_cache() for storing comparison results next to the JSON file.
 """
 
-from typing import Callable, NamedTuple, Union
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Set, Tuple, Union
 import json
+import os
 from .actor import Actor, actor_from_json
 from .actor_category import ActorCategory, actor_category_from_json
 from .activity import Activity, activity_from_json
 from .activity_category import ActivityCategory, activity_category_from_json
+from .derived_tags import DerivedTags
 from .event import Event, event_from_json
 from .model import Model, model_from_json
 from .physical_element import PhysicalElement, physical_element_from_json
 from .physical_element_category import PhysicalElementCategory, physical_element_category_from_json
+from .result_cache import ResultCache
 from .scenario import Scenario, scenario_from_json
-from .scenario_category import ScenarioCategory, scenario_category_from_json
+from .scenario_category import ScenarioCategory, scenario_category_from_json, _comprises_tags, \
+    _derived_tags_from_json
 from .scenario_element import get_empty_dm_object, DMObjects
+from .tags import Tag, TagSet, tag_set_from_json
 
 
 PossibleObject = NamedTuple("PossibleObject", [("type", object), ("from_json", Callable)])
@@ -41,6 +51,8 @@ class DocumentManagement:
         collections (dict): All JSON codes are contained here.
         realizations (DMObjects): All objects that are instantiated are
             contained here.
+        path (str): The JSON file from which the database is read or to which
+            it is stored.
     """
     def __init__(self, path_or_realizations: [str, DMObjects] = None):
         # Version of the DocumentManagement. This is used as meta information for the documents.
@@ -66,6 +78,12 @@ class DocumentManagement:
         # Create an empty "database"
         self.collections = dict()
         self.realizations = get_empty_dm_object()
+        self.path = None  # type: str
+        self._tag_index = None  # type: Dict[Tag, Set[int]]
+        self._scenario_closures = None  # type: Dict[int, int]
+        self._membership = None  # type: Dict[int, Set[int]]
+        self._category_members = None  # type: Dict[int, Set[int]]
+        self._derived_tags = dict()  # type: Dict[Tuple[str, int], DerivedTags]
         for possible_object in self.possible_objects:
             self.collections[possible_object] = dict()
 
@@ -87,6 +105,7 @@ class DocumentManagement:
         """
         with open(path, "w") as file:
             json.dump(self.collections, file, **kwargs)
+        self.path = path
 
     def from_json(self, path: str) -> None:
         """ Read a 'database' from a json file.
@@ -95,6 +114,12 @@ class DocumentManagement:
         """
         with open(path, "r") as file:
             self.collections = json.load(file)
+        self.path = path
+        self._tag_index = None
+        self._scenario_closures = None
+        self._membership = None
+        self._category_members = None
+        self._derived_tags = dict()
 
         for name in self.possible_objects:
             keys = list(self.collections[name].keys())
@@ -137,7 +162,9 @@ class DocumentManagement:
         # Write object to the database.
         json_code = item.to_json()
         json_code["_version"] = self.version
+        self._remove_from_indices(collection, item.uid)
         self.collections[collection][item.uid] = json_code
+        self._add_to_indices(collection, item.uid)
         if include_attributes:  # Write attributes of object also to the database if needed.
             self._include_attributes(item, collection)
 
@@ -167,6 +194,7 @@ class DocumentManagement:
         :param name: Name of the object.
         :param uid: The ID.
         """
+        self._remove_from_indices(name, uid)
         del self.collections[name][uid]
         if uid in getattr(self.realizations, name):
             del getattr(self.realizations, name)[uid]
@@ -184,6 +212,243 @@ class DocumentManagement:
         return self.possible_objects[name].from_json(self.collections[name][uid],
                                                      self.realizations)
 
+    def get_candidate_scenarios(self, scenario_category: ScenarioCategory) -> Set[int]:
+        """ Obtain the uids of the scenarios that the scenario category might comprise.
+
+        For a scenario category to comprise a scenario, each of the derived
+        tags of the scenario category (or a subtag) needs to be present in the
+        derived tags of the scenario. To quickly find those scenarios, an
+        inverted index is used that contains, for each tag, the uids of the
+        scenarios of which the derived tags contain that tag or a subtag. The
+        index is built when it is needed for the first time and it is updated
+        when scenarios are added or deleted.
+
+        Note that the returned scenarios are not necessarily comprised by the
+        scenario category, e.g., because the tags are not matched with the
+        right actors. Use get_comprised_scenarios() for the full check.
+
+        :param scenario_category: The scenario category.
+        :return: Set with the uids of the candidate scenarios.
+        """
+        return self._get_candidate_scenarios(scenario_category.derived_tags())
+
+    def _get_candidate_scenarios(self, derived_tags: DerivedTags) -> Set[int]:
+        index = self._get_tag_index()
+        tags = derived_tags.all_tags()
+        if not tags:
+            return set(self.collections["scenario"])
+
+        # Start with the tag with the fewest scenarios, such that the candidate set stays small.
+        tag_sets = sorted((index.get(tag, set()) for tag in tags), key=len)
+        candidates = set(tag_sets[0])
+        for tag_set in tag_sets[1:]:
+            if not candidates:
+                break
+            candidates &= tag_set
+        return candidates
+
+    def get_comprised_scenarios(self, scenario_category: ScenarioCategory) -> List[int]:
+        """ Obtain the uids of the scenarios that the scenario category comprises.
+
+        The result is the same as calling ScenarioCategory.comprises() for
+        each scenario in the database. First, the candidates are selected with
+        get_candidate_scenarios(). Next, the full check is only done for these
+        candidates, using the derived tags that are stored in the database, so
+        no scenarios are instantiated.
+
+        :param scenario_category: The scenario category.
+        :return: Sorted list with the uids of the comprised scenarios.
+        """
+        own_tags = scenario_category.derived_tags()
+        return [uid for uid in sorted(self._get_candidate_scenarios(own_tags))
+                if _comprises_tags(own_tags, self._get_derived_tags("scenario", uid))]
+
+    def get_membership(self) -> Dict[int, List[int]]:
+        """ Obtain, for each scenario, the scenario categories that comprise the scenario.
+
+        The result is the same as calling ScenarioCategory.comprises() for
+        each combination of a scenario category and a scenario in the
+        database. A membership table is used that is built when it is needed
+        for the first time, using the derived tags that are stored in the
+        database. After that, the table is updated when scenarios or scenario
+        categories are added or deleted: an added scenario is only checked
+        against the scenario categories in the database and an added scenario
+        category is only checked against the scenarios in the database (see
+        get_candidate_scenarios()). Nothing else is computed again.
+
+        :return: Dictionary with, for each scenario uid, the sorted list with
+            the uids of the scenario categories that comprise the scenario.
+        """
+        return {uid: sorted(categories) for uid, categories in self._get_membership().items()}
+
+    def get_comprising_categories(self, uid: int) -> List[int]:
+        """ Obtain the uids of the scenario categories that comprise a scenario.
+
+        The membership table is used, see get_membership().
+
+        :param uid: The uid of the scenario.
+        :return: Sorted list with the uids of the scenario categories.
+        """
+        return sorted(self._get_membership()[uid])
+
+    def get_result_cache(self, path: str = None, max_entries: int = 1000000) -> ResultCache:
+        """ Open the persistent cache with the results of comprises() and includes().
+
+        By default, the cache is stored in a separate file next to the JSON file
+        of the database: for "database.json", the file "database.cache.sqlite"
+        is created if it does not exist yet. This file can be removed at any
+        time; the results are then computed again. See ResultCache for more
+        details.
+
+        :param path: The path of the cache. By default, it is based on the path
+            of the JSON file of the database.
+        :param max_entries: The maximum number of results that are stored.
+        :return: The ResultCache.
+        """
+        if path is None:
+            if self.path is None:
+                raise ValueError("No path is provided and the database is not read from or " +
+                                 "stored to a JSON file.")
+            path = "{:s}.cache.sqlite".format(os.path.splitext(self.path)[0])
+        return ResultCache(path, max_entries=max_entries)
+
+    def _get_membership(self) -> Dict[int, Set[int]]:
+        if self._membership is None:
+            self._membership = {uid: set() for uid in self.collections["scenario"]}
+            self._category_members = dict()
+            for uid in self.collections["scenario_category"]:
+                self._add_category_to_membership(uid)
+        return self._membership
+
+    def _add_scenario_to_membership(self, uid: int) -> None:
+        if self._membership is None:
+            return
+        tags = self._get_derived_tags("scenario", uid)
+        self._membership[uid] = set()
+        for category_uid, members in self._category_members.items():
+            if _comprises_tags(self._get_derived_tags("scenario_category", category_uid), tags):
+                members.add(uid)
+                self._membership[uid].add(category_uid)
+
+    def _add_category_to_membership(self, uid: int) -> None:
+        if self._membership is None:
+            return
+        own_tags = self._get_derived_tags("scenario_category", uid)
+        self._category_members[uid] = {
+            scenario_uid for scenario_uid in self._get_candidate_scenarios(own_tags)
+            if _comprises_tags(own_tags, self._get_derived_tags("scenario", scenario_uid))}
+        for scenario_uid in self._category_members[uid]:
+            self._membership[scenario_uid].add(uid)
+
+    def _remove_from_membership(self, name: str, uid: int) -> None:
+        if self._membership is None:
+            return
+        if name == "scenario" and uid in self._membership:
+            for category_uid in self._membership.pop(uid):
+                self._category_members[category_uid].discard(uid)
+        elif name == "scenario_category" and uid in self._category_members:
+            for scenario_uid in self._category_members.pop(uid):
+                self._membership[scenario_uid].discard(uid)
+
+    def _add_to_indices(self, name: str, uid: int) -> None:
+        if name == "scenario":
+            self._add_to_tag_index(uid)
+            self._add_scenario_to_membership(uid)
+        elif name == "scenario_category":
+            self._add_category_to_membership(uid)
+
+    def _remove_from_indices(self, name: str, uid: int) -> None:
+        if name in ("scenario", "scenario_category"):
+            self._derived_tags.pop((name, uid), None)
+            self._remove_from_membership(name, uid)
+        if name == "scenario":
+            self._remove_from_tag_index(uid)
+
+    def _get_derived_tags(self, name: str, uid: int) -> DerivedTags:
+        # The derived tags are only obtained once from the JSON code.
+        if (name, uid) not in self._derived_tags:
+            self._derived_tags[(name, uid)] = _derived_tags_from_json(self.collections[name][uid])
+        return self._derived_tags[(name, uid)]
+
+    def _get_tag_index(self) -> Dict[Tag, Set[int]]:
+        if self._tag_index is None:
+            self._tag_index = dict()
+            self._scenario_closures = dict()
+            for uid in self.collections["scenario"]:
+                self._add_to_tag_index(uid)
+        return self._tag_index
+
+    def _add_to_tag_index(self, uid: int) -> None:
+        if self._tag_index is None:
+            return
+        closure = self._tag_set_from_json("scenario", self.collections["scenario"][uid]).closure()
+        self._scenario_closures[uid] = closure
+        for tag in TagSet(mask=closure):
+            self._tag_index.setdefault(tag, set()).add(uid)
+
+    def _remove_from_tag_index(self, uid: int) -> None:
+        if self._tag_index is None or uid not in self._scenario_closures:
+            return
+        for tag in TagSet(mask=self._scenario_closures.pop(uid)):
+            self._tag_index[tag].discard(uid)
+
+    def count_tags(self, name: str = "scenario") -> Dict[Tag, int]:
+        """ Count, for each tag, the number of items that carry that tag.
+
+        The counts are rolled up along the tag hierarchy: an item that carries
+        a subtag is also counted for all its supertags. For example, an actor
+        with the tag RoadUserType_CategoryM_Bus is also counted for the tag
+        RoadUserType_Vehicle. Each item is counted at most once per tag.
+
+        For scenarios and scenario categories, the derived tags are used. For
+        other objects, the tags of the object and the tags of its category (if
+        the category is stored in the database) are used. The counts are
+        computed directly from the JSON code, so no objects are instantiated.
+
+        :param name: Name of the object, e.g., "scenario" or "actor".
+        :return: Dictionary with the number of items for each Tag.
+        """
+        # Items with the same tags have the same closure, so each closure only needs to be
+        # expanded into the individual tags once.
+        category_tags = dict()
+        closures = Counter(self._tag_set_from_json(name, json_code, category_tags).closure()
+                           for json_code in self.collections[name].values())
+
+        counts = {tag: 0 for tag in Tag}
+        for closure, n_items in closures.items():
+            for tag in TagSet(mask=closure):
+                counts[tag] += n_items
+        return counts
+
+    def _tag_set_from_json(self, name: str, json_code: dict, category_tags: dict = None) \
+            -> TagSet:
+        """ Obtain all tags of an item from its JSON code.
+
+        :param name: Name of the object.
+        :param json_code: The JSON code of the item.
+        :param category_tags: Optional dictionary that is used to store the
+            tags of the categories, such that these are only parsed once.
+        :return: The derived tags, or the tags of the item and its category.
+        """
+        if "derived_tags" in json_code:
+            mask = tag_set_from_json(json_code["tags"]).mask
+            for tags in json_code["derived_tags"].values():
+                mask |= tag_set_from_json(tags).mask
+            return TagSet(mask=mask)
+
+        tag_set = tag_set_from_json(json_code["tags"])
+        category_name = "{:s}_category".format(name)
+        if "category" in json_code and category_name in self.collections:
+            if category_tags is None:
+                category_tags = dict()
+            uid = json_code["category"]["uid"]
+            if uid not in category_tags:
+                category_json = self.collections[category_name].get(uid)
+                category_tags[uid] = TagSet() if category_json is None else \
+                    tag_set_from_json(category_json["tags"])
+            tag_set = tag_set | category_tags[uid]
+        return tag_set
+
     def _actor_from_json(self, json_code: dict, realizations: DMObjects):
         actor_category = self.get_item("actor_category", json_code["category"]["uid"])
         return actor_from_json(json_code, realizations, category=actor_category)
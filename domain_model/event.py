@@ -9,13 +9,27 @@ Modifications:
 2020 08 22: Change how an event is created from json code. Result is the same.
 2020 08 24: Change superclass from ScenarioElement to QuantitativeElement.
 2020 10 05: Change way of getting properties of the time interval.
+2026 10 16: Store the time of the event if it is resolved from its conditions.
+2026 10 16: Only use the resolved time as long as the scenario has not changed.
 """
 
+from typing import NamedTuple, Tuple, Union
+import weakref
 from .quantitative_element import QuantitativeElement, _quantitative_element_props_from_json
 from .scenario_element import DMObjects, _object_from_json
 from .type_checking import check_for_type
 
 
+# The time of an event that is resolved from its conditions, see resolve_event(). The time is
+# valid as long as the version of the scenario and the conditions are the same. The times of the
+# other events that were used are needed for knowing whether the event needs to be resolved again.
+_Resolution = NamedTuple("_Resolution", [("scenario", weakref.ref), ("version", int),
+                                         ("conditions", dict), ("step", float),
+                                         ("tolerance", float),
+                                         ("times", Tuple[Union[float, None], ...]),
+                                         ("time", Union[float, None])])
+
+
 class Event(QuantitativeElement):
     """ Event
 
@@ -44,6 +58,35 @@ class Event(QuantitativeElement):
 
         QuantitativeElement.__init__(self, **kwargs)
         self.conditions = conditions  # type: dict
+        self._resolved = None  # type: Union[_Resolution, None]
+
+    def get_time(self) -> Union[float, None]:
+        """ Obtain the time of the event (if it is available).
+
+        The time is available if the conditions contain the time or if the time
+        has been resolved from the conditions, see resolve_event(). A resolved
+        time is not available anymore if the scenario (including its activities
+        and the parameters of its activities) or the conditions have changed
+        since it was resolved. In that case, resolve_event() needs to be used
+        again.
+
+        :return: The time of the event - if it is available. Otherwise, None.
+        """
+        if "time" in self.conditions:
+            return self.conditions["time"]
+        if self._resolved is not None:
+            # pylint: disable=protected-access
+            scenario = self._resolved.scenario()
+            if scenario is not None and scenario._version == self._resolved.version and \
+                    self._resolved.conditions == self.conditions:
+                return self._resolved.time
+        return None
+
+    def __getstate__(self) -> dict:
+        # The reference to the scenario cannot be copied, so the time needs to be resolved again.
+        state = QuantitativeElement.__getstate__(self)
+        state["_resolved"] = None
+        return state
 
     def to_json(self) -> dict:
         """ Get JSON code of object.
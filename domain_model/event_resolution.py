@@ -0,0 +1,248 @@
+""" Functions for resolving the time of events that are triggered by a condition
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from copy import deepcopy
+from typing import Callable, Dict, Union
+import weakref
+import numpy as np
+from .actor import Actor
+from .event import Event, _Resolution
+from .scenario import Scenario, _INTEGRALS, _initial_value
+from .state_variable import StateVariable
+from .type_checking import check_for_type
+
+
+# The rules of a state condition. For "equal_to", the condition holds as soon as the value is
+# reached or crossed.
+_RULES = ("less_than", "greater_than", "equal_to")
+
+# Number of subintervals in which a bracket is divided in each iteration of the root finding.
+_N_SUBINTERVALS = 16
+
+
+def resolve_event(scenario: Scenario, event: Event, step: float = 0.1,
+                  tolerance: float = 1e-6) -> Union[float, None]:
+    """ Obtain the time at which the condition of an event is met for the first time.
+
+    Events of which the conditions contain a time, e.g., dict(time=5), do not
+    need to be resolved. Other events can be triggered by a state condition,
+    e.g.,
+
+        conditions=dict(state_condition=dict(actor=<uid of lead vehicle>,
+                                             state_variable="LONGITUDINAL_POSITION",
+                                             relative_to=<uid of ego vehicle>,
+                                             rule="less_than", value=30))
+
+    means that the event happens as soon as the distance from the ego vehicle
+    to the lead vehicle is less than 30 meters. The state condition contains:
+     - actor: the uid of the actor.
+     - state_variable: the name of the state variable (see StateVariable).
+     - rule: "less_than", "greater_than", or "equal_to". For "equal_to", the
+       condition is met as soon as the value is reached or crossed, compared
+       to the first time instant at which the state is known.
+     - value: the threshold.
+     - relative_to (optional): the uid of another actor. If provided, the
+       state of this actor is subtracted from the state of the actor.
+    The state of an actor is evaluated using the activities of the actor. If
+    the actor has no activities for the longitudinal position (heading), the
+    integral of the speed (yaw rate) is used, see
+    Scenario.get_state_integral(). Otherwise, the initial state is used.
+
+    The condition is first evaluated at equidistant time instants between the
+    start and end of the scenario. The first interval in which the condition
+    becomes true is then narrowed down until it is smaller than `tolerance`:
+    in each iteration, the condition is evaluated at once for 16 time instants
+    within the interval. Activities that start or end with the event itself
+    are not used.
+
+    The result is stored with the event, such that the start time (or end
+    time) of activities that start (or end) with the event is known, see
+    TimeInterval.get_tstart(). If the scenario, its activities, or the
+    parameters of its activities change, Event.get_time() returns None until
+    the event is resolved again. This function reuses the stored result if
+    also the times of the other activities are the same.
+
+    :param scenario: The scenario that contains the event.
+    :param event: The event.
+    :param step: The time between two consecutive time instants.
+    :param tolerance: The maximum error of the resolved time.
+    :return: The time of the event, or None if the condition is never met
+        (or cannot be evaluated).
+    """
+    check_for_type("scenario", scenario, Scenario)
+    check_for_type("event", event, Event)
+    if "time" in event.conditions:
+        return event.conditions["time"]
+    if "state_condition" not in event.conditions:
+        return None
+    if step <= 0 or tolerance <= 0:
+        raise ValueError("Step and tolerance should be positive.")
+    tstart, tend = scenario.get_tstart(), scenario.get_tend()
+    if tstart is None or tend is None:
+        raise ValueError("Start time and end time of the scenario need to be known.")
+
+    # The activities that start or end with this event are not used, so their times are not needed.
+    # pylint: disable=protected-access
+    scenario._observe(scenario.activities)
+    times = tuple(None if event is activity.start or event is activity.end else
+                  (activity.get_tstart(), activity.get_tend()) for activity in scenario.activities)
+    resolved = event._resolved
+    if resolved is not None and resolved.scenario() is scenario and \
+            resolved.version == scenario._version and resolved.conditions == event.conditions \
+            and (resolved.step, resolved.tolerance, resolved.times) == (step, tolerance, times):
+        return resolved.time
+
+    event._resolved = None
+    condition = event.conditions["state_condition"]
+    if condition["rule"] not in _RULES:
+        raise ValueError("Rule '{:s}' is not valid, use one of {}.".format(
+            condition["rule"], _RULES))
+    function = _difference_function(scenario, condition)
+    time = _first_time(function, condition["rule"], tstart, tend, step, tolerance)
+
+    # If the time changes, the times of the activities that start or end with the event change.
+    # Therefore, the times of other events that depend on these activities need to be resolved
+    # again.
+    if (None if resolved is None else resolved.time) != time:
+        scenario._changed()
+    event._resolved = _Resolution(weakref.ref(scenario), scenario._version,
+                                  deepcopy(event.conditions), step, tolerance, times, time)
+    return time
+
+
+def resolve_events(scenario: Scenario, step: float = 0.1, tolerance: float = 1e-6) \
+        -> Dict[int, Union[float, None]]:
+    """ Resolve the times of all events of the activities of a scenario.
+
+    Because the condition of an event might depend on an activity that starts
+    with another event, the events are resolved repeatedly, until none of the
+    times changes anymore. Each event is resolved at most n+1 times, where n is
+    the number of events. See resolve_event() for details.
+
+    :param scenario: The scenario.
+    :param step: The time between two consecutive time instants.
+    :param tolerance: The maximum error of the resolved times.
+    :return: Dictionary with, for each event uid, the time of the event (None
+        if it cannot be resolved).
+    """
+    events = dict()  # type: Dict[int, Event]
+    for activity in scenario.activities:
+        for event in (activity.start, activity.end):
+            if "time" not in event.conditions:
+                events[event.uid] = event
+
+    # The version of the scenario increases if the time of any of the events changes.
+    times = {uid: None for uid in events}
+    for _ in range(len(events) + 1):
+        version = scenario._version  # pylint: disable=protected-access
+        for uid, event in events.items():
+            times[uid] = resolve_event(scenario, event, step=step, tolerance=tolerance)
+        if version == scenario._version:  # pylint: disable=protected-access
+            break
+    return times
+
+
+def _difference_function(scenario: Scenario, condition: dict) \
+        -> Callable[[np.ndarray], np.ndarray]:
+    """ Create a function that evaluates the difference between the state and the value.
+
+    :param scenario: The scenario.
+    :param condition: The state condition, see resolve_event().
+    :return: Function that returns, for each time instant, the state minus the
+        value of the condition. NaN is used if it cannot be evaluated.
+    """
+    actors = {actor.uid: actor for actor in scenario.actors}
+    state = getattr(StateVariable, condition["state_variable"])
+    actor = actors[int(condition["actor"])]
+    other = actors[int(condition["relative_to"])] if "relative_to" in condition else None
+
+    def _difference(time: np.ndarray) -> np.ndarray:
+        difference = _state_values(scenario, actor, state, time) - condition["value"]
+        if other is not None:
+            difference -= _state_values(scenario, other, state, time)
+        return difference
+    return _difference
+
+
+def _first_time(function: Callable[[np.ndarray], np.ndarray], rule: str, tstart: float,
+                tend: float, step: float, tolerance: float) -> Union[float, None]:
+    """ Find the first time instant at which the condition is met.
+
+    :param function: Function that returns the difference between the state
+        and the value of the condition.
+    :param rule: The rule of the condition, see resolve_event().
+    :param tstart: The start of the search interval.
+    :param tend: The end of the search interval.
+    :param step: The time between two consecutive time instants.
+    :param tolerance: The maximum error of the resolved time.
+    :return: The first time instant, or None if the condition is never met.
+    """
+    time = np.append(np.arange(tstart, tend, step), tend)
+    difference = function(time)
+    known = ~np.isnan(difference)
+    if not np.any(known):
+        return None
+    # For "equal_to", the sign of the difference is compared to the sign at the first time
+    # instant at which the state is known, e.g., the start of the activity of the actor.
+    initial_sign = np.sign(difference[np.argmax(known)])
+    is_met = _is_met(difference, rule, initial_sign)
+    if not np.any(is_met):
+        return None
+    index = np.argmax(is_met)
+    if index == 0:
+        return float(time[0])
+
+    # The condition is not met at the lower bound and it is met at the upper bound.
+    lower, upper = time[index-1], time[index]
+    while upper - lower > tolerance:
+        time = np.linspace(lower, upper, _N_SUBINTERVALS + 1)
+        is_met = _is_met(function(time[1:-1]), rule, initial_sign)
+        index = np.argmax(is_met) + 1 if np.any(is_met) else len(time) - 1
+        lower, upper = time[index-1], time[index]
+    return float(upper)
+
+
+def _is_met(difference: np.ndarray, rule: str, initial_sign: float) -> np.ndarray:
+    """ Evaluate whether a state condition is met.
+
+    :param difference: The state minus the value of the condition.
+    :param rule: The rule of the condition, see resolve_event().
+    :param initial_sign: For "equal_to", the sign of the first known difference.
+    :return: For each difference, whether the condition is met (False if the
+        difference is NaN).
+    """
+    if rule == "less_than":
+        is_met = difference < 0
+    elif rule == "greater_than":
+        is_met = difference > 0
+    else:
+        # The value is reached if the difference is 0 or if the sign differs from the initial sign.
+        is_met = np.logical_or(difference == 0, np.sign(difference) != initial_sign)
+    return np.logical_and(is_met, ~np.isnan(difference))
+
+
+def _state_values(scenario: Scenario, actor: Actor, state: StateVariable,
+                  time: np.ndarray) -> np.ndarray:
+    """ Evaluate the state of an actor at the given time instants.
+
+    :param scenario: The scenario.
+    :param actor: The actor.
+    :param state: The state variable.
+    :param time: The time instants.
+    :return: The values of the state (NaN if these cannot be evaluated).
+    """
+    # pylint: disable=protected-access
+    activities_by_state = scenario._get_act_index().activities_by_state
+    if (actor, state) in activities_by_state:
+        return scenario.sample(time, actors=[actor], states=[state])[0, 0]
+    integrands = [integrand for integrand, integral in _INTEGRALS.items() if integral == state]
+    if integrands and (actor, integrands[0]) in activities_by_state:
+        values = scenario.get_state_integral(actor, integrands[0], time)
+        if values is not None:
+            return values
+    return np.full(len(time), _initial_value(actor, state, np.nan), dtype=float)
@@ -0,0 +1,221 @@
+""" Class SafetyMetrics and functions for computing surrogate safety metrics
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from .actor import Actor
+from .document_management import DocumentManagement
+from .scenario import Scenario, _initial_value
+from .state_variable import StateVariable
+from .type_checking import check_for_type
+
+
+class SafetyMetrics:
+    """ SafetyMetrics - surrogate safety metrics of pairs of actors over time
+
+    The metrics are computed in road coordinates, i.e., using the longitudinal
+    position and the lateral position of the actors, for each pair of actors
+    (actor, other) and at each time instant:
+     - longitudinal_gap: the longitudinal distance between the actors, minus
+       half the length of both actors. It is negative if the actors overlap
+       longitudinally.
+     - lateral_gap: the lateral distance between the actors, minus half the
+       width of both actors. It is negative if the actors overlap laterally.
+     - ttc: the time-to-collision, i.e., the time until the actor hits the
+       other actor, if the other actor is in front of the actor, both actors
+       overlap laterally, and the actor drives faster than the other actor.
+       Otherwise, the time-to-collision is infinite.
+     - thw: the time headway, i.e., the time until the actor reaches the
+       current position of the rear of the other actor, if the other actor is
+       in front of the actor and both actors overlap laterally. Otherwise, the
+       time headway is infinite.
+    Each metric is an array with shape (number of pairs, number of time
+    instants). If the states of an actor are unknown at a time instant, the
+    metrics are NaN.
+
+    Attributes:
+        time (np.ndarray): The time instants.
+        pairs (List[Tuple[Actor, Actor]]): The pairs (actor, other).
+        longitudinal_gap (np.ndarray): The longitudinal gaps.
+        lateral_gap (np.ndarray): The lateral gaps.
+        ttc (np.ndarray): The times-to-collision.
+        thw (np.ndarray): The time headways.
+    """
+    metrics = ("longitudinal_gap", "lateral_gap", "ttc", "thw")
+
+    def __init__(self, time: np.ndarray, pairs: List[Tuple[Actor, Actor]],
+                 longitudinal_gap: np.ndarray, lateral_gap: np.ndarray, ttc: np.ndarray,
+                 thw: np.ndarray):
+        self.time = time
+        self.pairs = pairs
+        self.longitudinal_gap = longitudinal_gap
+        self.lateral_gap = lateral_gap
+        self.ttc = ttc
+        self.thw = thw
+
+    def minimum(self, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+        """ Obtain, for each pair of actors, the minimum of a metric and when it occurs.
+
+        If a metric is NaN (or infinite) at all time instants, the minimum is
+        NaN (or infinite) and the time of the minimum is NaN.
+
+        :param metric: The name of the metric, e.g., "ttc".
+        :return: The minimum values and the times of the minimum values.
+        """
+        if metric not in self.metrics:
+            raise ValueError("Metric '{:s}' is not valid, use one of {}.".format(
+                metric, self.metrics))
+        values = getattr(self, metric)
+        known = ~np.isnan(values)
+        index = np.argmin(np.where(known, values, np.inf), axis=1)
+        minima = values[np.arange(len(values)), index]
+        times = self.time[index]
+        minima[~np.any(known, axis=1)] = np.nan
+        times[~np.isfinite(minima)] = np.nan
+        return minima, times
+
+    def minima(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """ Obtain the minimum of each metric, see minimum().
+
+        :return: Dictionary with, for each metric, the minimum values and the
+            times of the minimum values.
+        """
+        return {metric: self.minimum(metric) for metric in self.metrics}
+
+
+def safety_metrics(scenario: Scenario, step: float = 0.1, tstart: float = None,
+                   tend: float = None, reference: Union[Actor, str] = None,
+                   actors: List[Actor] = None) -> SafetyMetrics:
+    """ Compute the surrogate safety metrics of pairs of actors of a scenario.
+
+    The states of all actors are evaluated at equidistant time instants and
+    the metrics of all pairs are computed at once with array operations. See
+    SafetyMetrics for the metrics.
+
+    The longitudinal position of an actor is obtained from the activities with
+    StateVariable.LONGITUDINAL_POSITION or, if there are none, it is the
+    integral of the speed (see Scenario.get_state_integral()). The lateral
+    position is obtained from the activities with
+    StateVariable.LATERAL_POSITION. If an actor has no activities for a state
+    variable, the initial state of the actor is used (0 if not provided). The
+    length and width of an actor are obtained from its properties ("length"
+    and "width"). If these are not provided, they are 0.
+
+    :param scenario: The scenario.
+    :param step: The time between two consecutive time instants.
+    :param tstart: The first time instant. By default, the start time.
+    :param tend: The last time instant. By default, the end time.
+    :param reference: The actor (or the name of the actor), e.g., the ego
+        vehicle, that is paired with each of the other actors. By default, all
+        ordered pairs of actors are used.
+    :param actors: The actors. By default, all actors of the scenario.
+    :return: The safety metrics.
+    """
+    check_for_type("scenario", scenario, Scenario)
+    time = scenario._time_grid(step, tstart, tend)  # pylint: disable=protected-access
+
+    actors = list(scenario.actors if actors is None else actors)
+    if isinstance(reference, str):
+        name = reference
+        reference = scenario.get_actor_by_name(name)
+        if reference is None:
+            raise ValueError("Scenario '{:s}' has no actor with name '{:s}'.".format(
+                scenario.name, name))
+    if reference is None:
+        pairs = [(i, j) for i in range(len(actors)) for j in range(len(actors)) if i != j]
+    else:
+        if reference not in actors:
+            actors.append(reference)
+        pairs = [(actors.index(reference), j) for j in range(len(actors))
+                 if actors[j] is not reference]
+    first, second = np.array(pairs, dtype=int).reshape(len(pairs), 2).T
+
+    states = _road_states(scenario, time, actors)
+    dimensions = _get_dimensions(actors)
+    delta = states[second, :2] - states[first, :2]
+    half_size = (dimensions[first] + dimensions[second])[:, :, np.newaxis] / 2
+    longitudinal_gap = np.abs(delta[:, 0]) - half_size[:, 0]
+    lateral_gap = np.abs(delta[:, 1]) - half_size[:, 1]
+
+    # Only if the other actor is in front of the actor and in the same "lane", it can be hit.
+    speed = states[first, 2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        in_path = np.logical_and(delta[:, 0] > 0, lateral_gap < 0)
+        distance = np.maximum(longitudinal_gap, 0)
+        closing_speed = speed - states[second, 2]
+        ttc = np.where(np.logical_and(in_path, closing_speed > 0), distance / closing_speed,
+                       np.inf)
+        thw = np.where(np.logical_and(in_path, speed > 0), distance / speed, np.inf)
+    unknown = np.isnan(delta).any(axis=1) | np.isnan(closing_speed)
+    ttc[unknown] = np.nan
+    thw[unknown] = np.nan
+
+    return SafetyMetrics(time, [(actors[i], actors[j]) for i, j in pairs], longitudinal_gap,
+                         lateral_gap, ttc, thw)
+
+
+def safety_metrics_database(document_management: DocumentManagement, step: float = 0.1,
+                            reference: str = None) -> Dict[int, SafetyMetrics]:
+    """ Compute the surrogate safety metrics of all scenarios of a database.
+
+    See safety_metrics() for details.
+
+    :param document_management: The DocumentManagement with the scenarios.
+    :param step: The time between two consecutive time instants.
+    :param reference: The name of the actor, e.g., the name of the ego
+        vehicle, that is paired with each of the other actors. By default, all
+        ordered pairs of actors are used.
+    :return: Dictionary with, for each scenario uid, the safety metrics.
+    """
+    return {uid: safety_metrics(document_management.get_item("scenario", uid), step=step,
+                                reference=reference)
+            for uid in document_management.collections["scenario"]}
+
+
+def _road_states(scenario: Scenario, time: np.ndarray, actors: List[Actor]) -> np.ndarray:
+    """ Evaluate the longitudinal position, lateral position, and speed of the actors.
+
+    :param scenario: The scenario.
+    :param time: The time instants.
+    :param actors: The actors.
+    :return: Array with shape (number of actors, 3, number of time instants).
+    """
+    states = [StateVariable.LONGITUDINAL_POSITION, StateVariable.LATERAL_POSITION,
+              StateVariable.SPEED]
+    values = scenario.sample(time, actors=actors, states=states)
+    # pylint: disable=protected-access
+    activities_by_state = scenario._get_act_index().activities_by_state
+    for i, actor in enumerate(actors):
+        has_activities = [(actor, state) in activities_by_state for state in states]
+        if not has_activities[2]:
+            if has_activities[0]:
+                values[i, 2] = scenario.sample(time, actors=[actor], states=states[:1],
+                                               derivative=True)[0, 0]
+            else:
+                values[i, 2] = _initial_value(actor, StateVariable.SPEED, 0.)
+        if not has_activities[0]:
+            if has_activities[2]:
+                position = scenario.get_state_integral(actor, StateVariable.SPEED, time)
+                values[i, 0] = np.nan if position is None else position
+            else:
+                tstart = time[0] if scenario.get_tstart() is None else scenario.get_tstart()
+                values[i, 0] = (_initial_value(actor, StateVariable.LONGITUDINAL_POSITION, 0.) +
+                                values[i, 2] * (time - tstart))
+        if not has_activities[1]:
+            values[i, 1] = _initial_value(actor, StateVariable.LATERAL_POSITION, 0.)
+    return values
+
+
+def _get_dimensions(actors: List[Actor]) -> np.ndarray:
+    """ Obtain the length and width of the actors from their properties.
+
+    :param actors: The actors.
+    :return: Array with, for each actor, the length and the width.
+    """
+    return np.array([[actor.properties.get("length", 0.), actor.properties.get("width", 0.)]
+                     for actor in actors], dtype=float).reshape(len(actors), 2)
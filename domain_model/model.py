@@ -19,14 +19,19 @@ Modifications:
 2020 10 30: For using options for the fit functions, use **kwargs instead of options.
 2020 11 06: Add Model MultiBSplines.
 2021 09 04: Add Messages.
+2026 10 16: Add get_state_batch() and get_state_dot_batch() for evaluating many parameter sets.
+2026 10 16: Add get_state_integral() for evaluating the integral of the state.
+2026 10 16: Accept arrays of parameters for the batch evaluation and use it for get_state().
+2026 10 16: Add create_parameters() and parameters_from_array() for storing parameters in arrays.
 """
 
 import sys
 from abc import abstractmethod
-from typing import Union
+from typing import Dict, Hashable, List, Tuple, Union
 import numpy as np
-from scipy.interpolate import splrep, splev
+from scipy.interpolate import BSpline, splantider, splrep, splev
 from .actor import Actor
+from .model_parameters import ModelParameters, _layout
 from .qualitative_element import QualitativeElement, _qualitative_element_props_from_json
 from .scenario_element import DMObjects, _object_from_json
 
@@ -57,7 +62,12 @@ class Model(QualitativeElement):
         tags (List[Tag]): The tags are used to determine whether a scenario
             category comprises a scenario.
         description(str): A string that qualitatively describes this thing.
+        parameter_names(Tuple[str, ...]): The names of the parameters, in the
+            order that is used for arrays of parameters (see get_state_batch()).
     """
+    # The names of the parameters, in the order that is used for arrays of parameters.
+    parameter_names = ()  # type: Tuple[str, ...]
+
     @abstractmethod
     def __init__(self, modelname: str, **kwargs):
         self._modelname = modelname
@@ -88,6 +98,169 @@ class Model(QualitativeElement):
         :return: Numpy array with the derivative of the state.
         """
 
+    def get_state_integral(self, pars: dict, time: np.ndarray) -> np.ndarray:
+        """ Return the integral of the state vector.
+
+        The integral is computed analytically, from time 0 up to the provided
+        time instances. Because the default time of the model is on the
+        interval [0, 1], the integral needs to be multiplied with the duration
+        to obtain the integral over the actual time.
+
+        :param pars: A dictionary with the parameters.
+        :param time: Time instances at which the model is to be evaluated.
+        :return: Numpy array with the integral of the state.
+        """
+        raise NotImplementedError("Model '{:s}' has no integral of the state.".format(
+            self._modelname))
+
+    def get_state_batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray) \
+            -> np.ndarray:
+        """ Return the state vectors for multiple sets of parameters.
+
+        The sets of parameters are either provided as a list of dictionaries
+        or as an n-by-p array, where n is the number of sets of parameters and
+        the columns contain the parameters in the order of `parameter_names`.
+        The time instants are either the same for all sets of parameters (a
+        vector) or different for each set of parameters (an n-by-m array). All
+        sets are evaluated at once using broadcasting. Models for which this is
+        not possible evaluate each set of parameters separately.
+
+        :param pars: The sets of parameters.
+        :param time: Time instances at which the model is to be evaluated.
+        :return: Numpy array with, for each set of parameters, the state.
+        """
+        return self._batch(pars, _batch_time(len(pars), time), False)
+
+    def get_state_dot_batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray) \
+            -> np.ndarray:
+        """ Return the derivatives of the state vectors for multiple sets of parameters.
+
+        See get_state_batch() for the shape of the parameters and the time
+        instants.
+
+        :param pars: The sets of parameters.
+        :param time: Time instances at which the model is to be evaluated.
+        :return: Numpy array with, for each set of parameters, the derivative of
+            the state.
+        """
+        return self._batch(pars, _batch_time(len(pars), time), True)
+
+    def _batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray,
+               derivative: bool) -> np.ndarray:
+        """ Evaluate the state (or its derivative) for multiple sets of parameters.
+
+        By default, each set of parameters is evaluated separately. Models that
+        evaluate all sets at once override this method.
+
+        :param pars: The sets of parameters.
+        :param time: The time instants, with a row for each set of parameters.
+        :param derivative: Whether to evaluate the derivative of the state.
+        :return: Numpy array with, for each set of parameters, the state.
+        """
+        if isinstance(pars, np.ndarray):
+            pars = [dict(zip(self.parameter_names, values)) for values in pars]
+        function = self.get_state_dot if derivative else self.get_state
+        return np.array([function(par, tdata) for par, tdata in zip(pars, time)])
+
+    def _batch_group(self) -> Hashable:
+        """ Return a key for grouping models whose sets of parameters can be evaluated together.
+
+        Sets of parameters of models with the same key can be evaluated at once
+        using one of these models (see get_states()). Models that evaluate each
+        set of parameters separately might use their own options, so they are
+        not grouped with other models.
+
+        :return: The key.
+        """
+        if type(self)._batch is Model._batch:
+            return self
+        return type(self)
+
+    def _single(self, pars: dict, time: Union[np.ndarray, float], derivative: bool) \
+            -> np.ndarray:
+        """ Evaluate the state (or its derivative) for one set of parameters using _batch().
+
+        :param pars: A dictionary with the parameters.
+        :param time: Time instances at which the model is to be evaluated.
+        :param derivative: Whether to evaluate the derivative of the state.
+        :return: Numpy array with the state.
+        """
+        time = np.asarray(time, dtype=float)
+        result = self._batch([pars], np.atleast_1d(time)[np.newaxis], derivative)[0]
+        return result[..., 0] if time.ndim == 0 else result
+
+    def _pars_array(self, pars: Union[np.ndarray, List[dict]]) -> np.ndarray:
+        """ Return the sets of parameters as an n-by-p array.
+
+        :param pars: The sets of parameters.
+        :return: Array with a row for each set of parameters.
+        """
+        if isinstance(pars, np.ndarray):
+            if pars.ndim != 2 or pars.shape[1] != len(self.parameter_names):
+                raise ValueError("Parameters should be an n-by-{:d} array for model '{:s}'.".
+                                 format(len(self.parameter_names), self._modelname))
+            return pars.astype(float)
+        if not pars:
+            return np.zeros((0, len(self.parameter_names)))
+        layout = _layout(tuple((name, ()) for name in self.parameter_names))
+        # pylint: disable=protected-access
+        if all(isinstance(par, ModelParameters) and par._layout is layout for par in pars):
+            return np.array([par.array for par in pars])
+        return np.array([[par[name] for name in self.parameter_names] for par in pars],
+                        dtype=float)
+
+    def create_parameters(self, pars: dict) -> ModelParameters:
+        """ Return the parameters with the numerical parameters stored in one array.
+
+        See ModelParameters. By default, the fields are the parameters of
+        `parameter_names`. Models with parameters that are arrays, such as the
+        knots and the coefficients of splines, use these as fields.
+
+        :param pars: A dictionary with the parameters.
+        :return: The parameters.
+        """
+        fields = self._parameter_fields(pars)
+        parameters = ModelParameters(fields, **{name: value for name, value in pars.items()
+                                                if name not in fields})
+        for name in fields:
+            parameters[name] = pars[name]
+        return parameters
+
+    def parameters_from_array(self, pars: np.ndarray) -> List[ModelParameters]:
+        """ Return the sets of parameters of an n-by-p array without copying the values.
+
+        The columns contain the parameters in the same order as for
+        get_state_batch(). Each of the returned sets of parameters uses a row of
+        the array, so changing the array changes the parameters. This is useful
+        for storing the parameters of many activities with little memory.
+
+        :param pars: The sets of parameters.
+        :return: List with, for each row, the parameters.
+        """
+        pars = np.ascontiguousarray(pars, dtype=np.float64)
+        fields, other = self._array_fields()
+        size = sum(int(np.prod(shape, dtype=int)) for shape in fields.values())
+        if pars.ndim != 2 or pars.shape[1] != size:
+            raise ValueError("Parameters should be an n-by-{:d} array for model '{:s}'.".
+                             format(size, self._modelname))
+        return [ModelParameters(fields, row, **other) for row in pars]
+
+    def _parameter_fields(self, pars: dict) -> Dict[str, Tuple[int, ...]]:
+        """ Return the name and shape of the parameters that are stored in an array.
+
+        :param pars: A dictionary with the parameters.
+        :return: The fields, see ModelParameters.
+        """
+        return {name: () for name in self.parameter_names if name in pars}
+
+    def _array_fields(self) -> Tuple[Dict[str, Tuple[int, ...]], dict]:
+        """ Return the fields of the rows of an array of parameters and the other parameters.
+
+        :return: The fields (see ModelParameters) and the parameters that are
+            the same for all rows.
+        """
+        return {name: () for name in self.parameter_names}, dict()
+
     def fit(self, time: np.ndarray, data: np.ndarray, **kwargs) -> dict:
         """ Fit the data to the model and return the parameters
 
@@ -133,11 +306,27 @@ class Constant(Model):
     def __init__(self, **kwargs):
         Model.__init__(self, "Constant", **kwargs)
 
+    parameter_names = ("xstart",)
+
     def get_state(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        return np.ones(len(time))*pars["xstart"]
+        return self._evaluate(time, False, pars["xstart"])
 
     def get_state_dot(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        return np.zeros(len(time))
+        return self._evaluate(time, True, pars["xstart"])
+
+    def get_state_integral(self, pars: dict, time: np.ndarray) -> np.ndarray:
+        return time*pars["xstart"]
+
+    def _batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray,
+               derivative: bool) -> np.ndarray:
+        return self._evaluate(time, derivative, *_columns(self._pars_array(pars)))
+
+    @staticmethod
+    def _evaluate(time: np.ndarray, derivative: bool, xstart: Union[float, np.ndarray]) \
+            -> np.ndarray:
+        if derivative:
+            return np.zeros(np.shape(time))
+        return np.ones(np.shape(time))*xstart
 
     def fit(self, time: np.ndarray, data: np.ndarray, **kwargs) -> dict:
         return dict(xstart=np.mean(data))
@@ -158,11 +347,27 @@ class Linear(Model):
         Model.__init__(self, "Linear", **kwargs)
         self.default_options = dict(endpoints=endpoints)
 
+    parameter_names = ("xstart", "xend")
+
     def get_state(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        return pars["xstart"] + time*(pars["xend"] - pars["xstart"])
+        return self._evaluate(time, False, pars["xstart"], pars["xend"])
 
     def get_state_dot(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        return np.ones(len(time)) * (pars["xend"] - pars["xstart"])
+        return self._evaluate(time, True, pars["xstart"], pars["xend"])
+
+    def get_state_integral(self, pars: dict, time: np.ndarray) -> np.ndarray:
+        return pars["xstart"]*time + time**2*(pars["xend"] - pars["xstart"])/2
+
+    def _batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray,
+               derivative: bool) -> np.ndarray:
+        return self._evaluate(time, derivative, *_columns(self._pars_array(pars)))
+
+    @staticmethod
+    def _evaluate(time: np.ndarray, derivative: bool, xstart: Union[float, np.ndarray],
+                  xend: Union[float, np.ndarray]) -> np.ndarray:
+        if derivative:
+            return np.ones(np.shape(time)) * (xend - xstart)
+        return xstart + time*(xend - xstart)
 
     def fit(self, time: np.ndarray, data: np.ndarray, **kwargs) -> dict:
         # Set the options correctly
@@ -191,14 +396,30 @@ class Sinusoidal(Model):
     def __init__(self, **kwargs):
         Model.__init__(self, "Sinusoidal", **kwargs)
 
+    parameter_names = ("xstart", "xend")
+
     def get_state(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        offset = (pars["xstart"] + pars["xend"]) / 2
-        amplitude = (pars["xstart"] - pars["xend"]) / 2
-        return amplitude*np.cos(np.pi*time) + offset
+        return self._evaluate(time, False, pars["xstart"], pars["xend"])
 
     def get_state_dot(self, pars: dict, time: np.ndarray) -> np.ndarray:
+        return self._evaluate(time, True, pars["xstart"], pars["xend"])
+
+    def get_state_integral(self, pars: dict, time: np.ndarray) -> np.ndarray:
+        offset = (pars["xstart"] + pars["xend"]) / 2
         amplitude = (pars["xstart"] - pars["xend"]) / 2
-        return -np.pi*amplitude*np.sin(np.pi*time)
+        return amplitude*np.sin(np.pi*time)/np.pi + offset*time
+
+    def _batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray,
+               derivative: bool) -> np.ndarray:
+        return self._evaluate(time, derivative, *_columns(self._pars_array(pars)))
+
+    @staticmethod
+    def _evaluate(time: np.ndarray, derivative: bool, xstart: Union[float, np.ndarray],
+                  xend: Union[float, np.ndarray]) -> np.ndarray:
+        amplitude = (xstart - xend) / 2
+        if derivative:
+            return -np.pi*amplitude*np.sin(np.pi*time)
+        return amplitude*np.cos(np.pi*time) + (xstart + xend) / 2
 
     def fit(self, time: np.ndarray, data: np.ndarray, **kwargs) -> dict:
         # Normalize the time
@@ -223,6 +444,8 @@ class Spline3Knots(Model):
     the spline function should ensure that the start and end values are the same
     as for the provided data.
     """
+    parameter_names = ("a1", "b1", "c1", "d1", "a2", "b2", "c2", "d2")
+
     def __init__(self, endpoints=False, **kwargs):
         Model.__init__(self, "Spline3Knots", **kwargs)
         self.default_options = dict(endpoints=endpoints)
@@ -237,18 +460,34 @@ class Spline3Knots(Model):
         self.usvh_endpoints = np.linalg.svd(self.constraint_matrix_endpoints)
 
     def get_state(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        tdata1 = time[time < .5]
-        tdata2 = time[time >= .5]
-        ydata1 = (pars["a1"]*tdata1**3 + pars["b1"]*tdata1**2 + pars["c1"]*tdata1 + pars["d1"])
-        ydata2 = (pars["a2"]*tdata2**3 + pars["b2"]*tdata2**2 + pars["c2"]*tdata2 + pars["d2"])
-        return np.concatenate((ydata1, ydata2))
+        return self._evaluate(time, False, *[pars[name] for name in self.parameter_names])
 
     def get_state_dot(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        tdata1 = time[time < .5]
-        tdata2 = time[time >= .5]
-        ydata1 = 3*pars["a1"]*tdata1**2 + 2*pars["b1"]*tdata1 + pars["c1"]
-        ydata2 = 3*pars["a2"]*tdata2**2 + 2*pars["b2"]*tdata2 + pars["c2"]
-        return np.concatenate((ydata1, ydata2))
+        return self._evaluate(time, True, *[pars[name] for name in self.parameter_names])
+
+    def get_state_integral(self, pars: dict, time: np.ndarray) -> np.ndarray:
+        # The first spline is integrated up to the interior knot, the second spline from there on.
+        tdata1 = np.minimum(time, .5)
+        tdata2 = np.maximum(time, .5)
+        ydata1 = (pars["a1"]/4*tdata1**4 + pars["b1"]/3*tdata1**3 + pars["c1"]/2*tdata1**2 +
+                  pars["d1"]*tdata1)
+        ydata2 = (pars["a2"]/4*(tdata2**4 - .5**4) + pars["b2"]/3*(tdata2**3 - .5**3) +
+                  pars["c2"]/2*(tdata2**2 - .5**2) + pars["d2"]*(tdata2 - .5))
+        return ydata1 + ydata2
+
+    def _batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray,
+               derivative: bool) -> np.ndarray:
+        return self._evaluate(time, derivative, *_columns(self._pars_array(pars)))
+
+    @staticmethod
+    def _evaluate(time: np.ndarray, derivative: bool, *coefficients: Union[float, np.ndarray]) \
+            -> np.ndarray:
+        a1, b1, c1, d1, a2, b2, c2, d2 = coefficients
+        if derivative:
+            return np.where(time < .5, (3*a1*time + 2*b1)*time + c1,
+                            (3*a2*time + 2*b2)*time + c2)
+        return np.where(time < .5, ((a1*time + b1)*time + c1)*time + d1,
+                        ((a2*time + b2)*time + c2)*time + d2)
 
     def fit(self, time: np.ndarray, data: np.ndarray, **kwargs) -> dict:
         options = self._set_default_options(**kwargs)
@@ -293,16 +532,77 @@ class Splines(Model):
     - degree: the degree of the splines (default=3).
     - n_knots: the number of interior knots (default=3).
     The interior knots will be evenly distributed.
+
+    For evaluating multiple sets of parameters with an array (see
+    get_state_batch()), each row contains the coefficients. The knots and the
+    degree are then the same as the ones that are used by the fit-function.
     """
     def __init__(self, degree=3, n_knots=3, **kwargs):
         Model.__init__(self, "Splines", **kwargs)
         self.default_options = dict(degree=degree, n_knots=n_knots)
 
     def get_state(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        return splev(time, (pars["knots"], pars["coefficients"], pars["degree"]))
+        return self._single(pars, time, False)
 
     def get_state_dot(self, pars: dict, time: np.ndarray) -> np.ndarray:
-        return splev(time, (pars["knots"], pars["coefficients"], pars["degree"]), 1)
+        return self._single(pars, time, True)
+
+    def get_state_integral(self, pars: dict, time: np.ndarray) -> np.ndarray:
+        tck = splantider((np.asarray(pars["knots"]), np.asarray(pars["coefficients"]),
+                          pars["degree"]))
+        return splev(time, tck) - splev(0, tck)
+
+    def get_knots(self) -> np.ndarray:
+        """ Return the knots that are used by the fit-function.
+
+        :return: The knots, including the knots at the boundaries.
+        """
+        degree, n_knots = self.default_options["degree"], self.default_options["n_knots"]
+        return np.concatenate((np.zeros(degree + 1), np.arange(1, n_knots+1) / (n_knots + 1),
+                               np.ones(degree + 1)))
+
+    def _parameter_fields(self, pars: dict) -> Dict[str, Tuple[int, ...]]:
+        return {name: np.shape(pars[name]) for name in ("knots", "coefficients")}
+
+    def _array_fields(self) -> Tuple[Dict[str, Tuple[int, ...]], dict]:
+        knots, degree = self.get_knots(), self.default_options["degree"]
+        return dict(coefficients=(len(knots) - degree - 1,)), dict(knots=knots, degree=degree)
+
+    def _batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray,
+               derivative: bool) -> np.ndarray:
+        # Sets of parameters with the same knots (e.g., because they are fitted with the same
+        # options) share the same basis functions, so the basis functions are only evaluated once.
+        if isinstance(pars, np.ndarray):
+            knots, degree = self.get_knots(), self.default_options["degree"]
+            if pars.ndim != 2 or pars.shape[1] != len(knots) - degree - 1:
+                raise ValueError("Parameters should be an n-by-{:d} array for model '{:s}'.".
+                                 format(len(knots) - degree - 1, self._modelname))
+            groups = {(tuple(knots), degree): list(range(len(pars)))}
+            coefficients = pars
+        elif len(pars) == 1:
+            # A single set of parameters, e.g., from get_state(), does not need to be grouped.
+            tck = (pars[0]["knots"], pars[0]["coefficients"], pars[0]["degree"])
+            return splev(time[0], tck, int(derivative))[np.newaxis]
+        else:
+            groups = dict()  # type: Dict[Tuple, List[int]]
+            for i, par in enumerate(pars):
+                groups.setdefault((tuple(par["knots"]), par["degree"]), []).append(i)
+            coefficients = [par["coefficients"] for par in pars]
+
+        result = np.zeros(time.shape)
+        for (knots, degree), indices in groups.items():
+            n_basis = len(knots) - degree - 1
+            if len(indices) == 1:
+                result[indices[0]] = splev(time[indices[0]], (knots, coefficients[indices[0]],
+                                                              degree), int(derivative))
+                continue
+            basis = BSpline(np.array(knots, dtype=float), np.eye(n_basis), degree)
+            basis = basis(time[indices].ravel(), int(derivative))
+            basis = basis.reshape(len(indices), time.shape[1], n_basis)
+            group_coefficients = np.array([coefficients[i][:n_basis] for i in indices],
+                                          dtype=float)
+            result[indices] = np.einsum("ijk,ik->ij", basis, group_coefficients)
+        return result
 
     def fit(self, time: np.ndarray, data: np.ndarray, **kwargs) -> dict:
         # Normalize the time
@@ -321,7 +621,12 @@ class Splines(Model):
 
 
 class MultiBSplines(Model):
-    """ BSplines, dealing with multivariate data. """
+    """ BSplines, dealing with multivariate data.
+
+    For evaluating multiple sets of parameters with an array (see
+    get_state_batch()), each row contains the coefficients of all dimensions,
+    one dimension after the other.
+    """
     def __init__(self, dimension: int, degree=3, n_knots=3, **kwargs):
         Model.__init__(self, "MultiBSplines", **kwargs)
 
@@ -347,19 +652,43 @@ class MultiBSplines(Model):
         return pars
 
     def get_state(self, pars: dict, time: np.ndarray = None) -> np.ndarray:
-        result = np.array([self.spline.get_state(dict(coefficients=pars["coefficients"][i],
-                                                      degree=pars["degree"][i],
-                                                      knots=pars["knots"][i]),
-                                                 time)
-                           for i in range(self.dimension)])
-        return result
+        return self._single(pars, time, False)
 
     def get_state_dot(self, pars: dict, time: np.ndarray = None) -> np.ndarray:
-        result = np.array([self.spline.get_state_dot(dict(coefficients=pars["coefficients"][i],
-                                                          degree=pars["degree"][i],
-                                                          knots=pars["knots"][i]),
-                                                     time)
-                           for i in range(self.dimension)])
+        return self._single(pars, time, True)
+
+    def _batch(self, pars: Union[np.ndarray, List[dict]], time: np.ndarray,
+               derivative: bool) -> np.ndarray:
+        # Each dimension is a separate set of parameters of the spline model.
+        time = np.repeat(time, self.dimension, axis=0)
+        if isinstance(pars, np.ndarray):
+            if pars.ndim != 2 or pars.shape[1] % self.dimension:
+                raise ValueError("Each row of the parameters should contain the coefficients " +
+                                 "of all {:d} dimensions.".format(self.dimension))
+            spline_pars = pars.reshape(len(pars)*self.dimension, -1)
+        else:
+            spline_pars = [dict(coefficients=par["coefficients"][i], degree=par["degree"][i],
+                                knots=par["knots"][i])
+                           for par in pars for i in range(self.dimension)]
+        result = self.spline._batch(spline_pars, time,  # pylint: disable=protected-access
+                                    derivative)
+        return result.reshape(len(pars), self.dimension, time.shape[1])
+
+    def _batch_group(self) -> Hashable:
+        return type(self), self.dimension
+
+    def _parameter_fields(self, pars: dict) -> Dict[str, Tuple[int, ...]]:
+        return {name: np.shape(pars[name]) for name in ("knots", "coefficients")}
+
+    def _array_fields(self) -> Tuple[Dict[str, Tuple[int, ...]], dict]:
+        knots, degree = self.spline.get_knots(), self.spline.default_options["degree"]
+        return (dict(coefficients=(self.dimension, len(knots) - degree - 1)),
+                dict(knots=[knots]*self.dimension, degree=[degree]*self.dimension))
+
+    def get_state_integral(self, pars: dict, time: np.ndarray = None) -> np.ndarray:
+        result = np.array([self.spline.get_state_integral(
+            dict(coefficients=pars["coefficients"][i], degree=pars["degree"][i],
+                 knots=pars["knots"][i]), time) for i in range(self.dimension)])
         return result
 
 
@@ -426,6 +755,31 @@ def _model_from_json(
     return getattr(sys.modules[__name__], json["modelname"])(**_model_props_from_json(json))
 
 
+def _batch_time(n_sets: int, time: np.ndarray) -> np.ndarray:
+    """ Return the time instants for each set of parameters as an n-by-m array.
+
+    :param n_sets: The number of sets of parameters.
+    :param time: Time instants, either shared (vector) or for each set (array).
+    :return: The n-by-m array with the time instants.
+    """
+    time = np.asarray(time, dtype=float)
+    if time.ndim == 1:
+        return np.broadcast_to(time, (n_sets, len(time)))
+    if time.ndim != 2 or time.shape[0] != n_sets:
+        raise ValueError("Time should be a vector or an array with a row for each set of " +
+                         "parameters.")
+    return time
+
+
+def _columns(pars: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """ Return, for each parameter, a column vector with the values of all sets.
+
+    :param pars: An n-by-p array with the sets of parameters.
+    :return: Tuple with an n-by-1 array for each of the parameters.
+    """
+    return tuple(pars[:, i:i+1] for i in range(pars.shape[1]))
+
+
 def model_from_json(json: dict, attribute_objects: DMObjects = None) -> Model:
     """ Get Model object from JSON code
 
@@ -0,0 +1,159 @@
+""" Class ModelParameters
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterator, Tuple
+import numpy as np
+
+
+class ModelParameters(MutableMapping):
+    """ ModelParameters - parameters of a model that are stored in one array
+
+    The numerical parameters of a model are stored in one contiguous array with
+    float64 values. The layout of this array is fixed by the fields, i.e., the
+    name and the shape of each numerical parameter. A field with shape () is
+    returned as a float. The other fields are returned as views of the array,
+    so the parameters can be used for evaluating a model without converting
+    lists to arrays. Parameters that are not numerical or that are shared by
+    many sets of parameters, such as the degree of splines, are stored as they
+    are. Use Model.create_parameters() or Model.parameters_from_array() to
+    create the parameters for a model, or use use_model_parameters() to store
+    the parameters of activities as ModelParameters. By default, the
+    parameters of activities are dictionaries.
+
+    The parameters can be used like a dictionary, e.g., as the parameters of
+    an Activity. Setting a field writes the values into the array, so the shape
+    of a field cannot change and a field cannot be removed. Changes of the
+    values of a view, e.g., parameters["coefficients"][0] = 1, are not noticed
+    by the activity. The JSON code (see to_json()) is the same as for a
+    dictionary with lists, so it can be read as a dictionary.
+
+    Attributes:
+        fields (Dict[str, Tuple[int, ...]]): The name and shape of each field.
+        array (np.ndarray): The values of all fields, one field after the other.
+    """
+    def __init__(self, fields: Dict[str, Tuple[int, ...]], array: np.ndarray = None,
+                 **parameters):
+        self._layout = _layout(tuple((name, tuple(shape)) for name, shape in fields.items()))
+        size = sum(stop - start for start, stop, _ in self._layout.values())
+        if array is None:
+            array = np.zeros(size)
+        else:
+            array = np.ascontiguousarray(array, dtype=np.float64)
+        if array.shape != (size,):
+            raise ValueError("Array should be a vector with {:d} values, but it has shape {}."
+                             .format(size, array.shape))
+        for name in parameters:
+            if name in self._layout:
+                raise ValueError("Parameter '{:s}' cannot be both a field and another parameter."
+                                 .format(name))
+        self.array = array
+        self._other = parameters
+        self._owner = None
+
+    @property
+    def fields(self) -> Dict[str, Tuple[int, ...]]:
+        """ The name and shape of each field. """
+        return {name: shape for name, (_, _, shape) in self._layout.items()}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._layout:
+            start, stop, shape = self._layout[key]
+            if not shape:
+                return float(self.array[start])
+            if len(shape) == 1:
+                return self.array[start:stop]
+            return self.array[start:stop].reshape(shape)
+        return self._other[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._layout:
+            start, stop, shape = self._layout[key]
+            value = np.asarray(value, dtype=np.float64)
+            if value.shape != shape:
+                raise ValueError("Field '{:s}' should have shape {}, but the value has shape {}."
+                                 .format(key, shape, value.shape))
+            self.array[start:stop] = value.ravel()
+        else:
+            self._other[key] = value
+        self._changed()
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._layout:
+            raise ValueError("Field '{:s}' cannot be removed.".format(key))
+        del self._other[key]
+        self._changed()
+
+    def __iter__(self) -> Iterator[str]:
+        return chain(self._layout, self._other)
+
+    def __len__(self) -> int:
+        return len(self._layout) + len(self._other)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Mapping) or set(self) != set(other):
+            return False
+        return all(np.array_equal(self[key], other[key]) if key in self._layout else
+                   self[key] == other[key] for key in self)
+
+    def __repr__(self) -> str:
+        return "{:s}({})".format(type(self).__name__, dict(self))
+
+    def __getstate__(self) -> dict:
+        # The activity that owns the parameters is not copied.
+        state = self.__dict__.copy()
+        state["_owner"] = None
+        return state
+
+    def _changed(self) -> None:
+        if self._owner is not None:
+            self._owner._parameters_changed()  # pylint: disable=protected-access
+
+    def copy(self) -> "ModelParameters":
+        """ Return a copy of the parameters with a copy of the array.
+
+        :return: The copy.
+        """
+        return ModelParameters(self.fields, self.array.copy(), **self._other)
+
+    def to_json(self) -> dict:
+        """ Return the parameters as a dictionary with lists instead of arrays.
+
+        :return: Dictionary with the parameters.
+        """
+        return {key: _to_json(value) for key, value in self.items()}
+
+
+@lru_cache(maxsize=None)
+def _layout(fields: Tuple[Tuple[str, Tuple[int, ...]], ...]) \
+        -> Dict[str, Tuple[int, int, Tuple[int, ...]]]:
+    """ Return the start, end, and shape of each field in the array.
+
+    Parameters with the same fields share the same layout, so a layout is not
+    stored for each set of parameters.
+
+    :param fields: The name and shape of each field.
+    :return: Dictionary with, for each field, the start, end, and shape.
+    """
+    layout = dict()
+    start = 0
+    for name, shape in fields:
+        stop = start + int(np.prod(shape, dtype=int))
+        layout[name] = (start, stop, shape)
+        start = stop
+    return layout
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
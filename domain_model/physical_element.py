@@ -7,6 +7,7 @@ Modifications:
 2020 08 22: Add function to obtain properties from a dictionary.
 2020 10 12: From now on, PhysicalThing is not an abstract class.
 2020 10 25: Change PhysicalThing to PhysicalElement.
+2026 10 16: Keep track of changes of the category, such that derived tags can be cached.
 """
 
 from typing import Union
@@ -38,9 +39,20 @@ class PhysicalElement(QuantitativeElement):
         check_for_type("properties", properties, dict)
 
         QuantitativeElement.__init__(self, **kwargs)
-        self.category = category  # type: PhysicalElementCategory
+        self.category = category
         self.properties = dict() if properties is None else properties
 
+    @property
+    def category(self) -> PhysicalElementCategory:
+        """ The category of the physical element. """
+        return self._category
+
+    @category.setter
+    def category(self, category: PhysicalElementCategory) -> None:
+        self._category = category
+        self._observe([category])
+        self._changed()
+
     def get_tags(self) -> dict:
         return self.tags + self.category.get_tags()
 
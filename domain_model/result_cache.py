@@ -0,0 +1,200 @@
+""" Class ResultCache
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Dict, Tuple
+from .derived_tags import DerivedTags
+from .scenario import Scenario
+from .scenario_category import ScenarioCategory, _comprises_tags
+from .tags import Tag
+from .type_checking import check_for_type
+
+
+# Number of new results and number of seconds after which the new results are written to disk.
+_COMMIT_INTERVAL = 1000
+_COMMIT_SECONDS = 1.
+
+
+class ResultCache:
+    """ ResultCache - a persistent cache of the results of comprises() and includes()
+
+    Whether a scenario category comprises a scenario (or includes another
+    scenario category) only depends on the derived tags of both. The results
+    are stored in an SQLite database, where each result is stored using the
+    fingerprints of both derived tags (see DerivedTags.fingerprint()). Hence,
+    the results remain valid when the program is restarted and they are
+    automatically not used anymore if the tags or the acts of the scenario
+    (category) change.
+
+    The number of stored results is bounded by `max_entries`. If more results
+    are stored, the results that are least recently used are removed.
+
+    The results also depend on the Tag enumeration, e.g., on which tags are
+    subtags of other tags. Therefore, the database also stores a fingerprint of
+    the Tag enumeration. If the Tag enumeration has changed, all results are
+    removed when the database is opened. The results can also be removed with
+    clear().
+
+    New results are written to disk after every 1000 new results, when a new
+    result is stored more than a second after the previous write, with
+    flush(), or when closing the cache. For removing the least recently used
+    results, the time at which a stored result is used is kept in memory and
+    written to disk together with the new results, so using a stored result
+    does not write to the database. ResultCache can also be used as a context
+    manager.
+
+    Attributes:
+        path (str): The path of the SQLite database.
+        max_entries (int): The maximum number of results that are stored.
+        hits (int): Number of lookups for which the result was stored.
+        misses (int): Number of lookups for which the result was computed.
+    """
+    def __init__(self, path: str, max_entries: int = 1000000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._n_pending = 0
+        self._last_flush = time.time()
+        self._last_used = dict()  # type: Dict[Tuple[str, str], float]
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS results (own TEXT, other TEXT, " +
+                                 "result INTEGER, last_used REAL, PRIMARY KEY (own, other))")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_used " +
+                                 "ON results (last_used)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, " +
+                                 "value TEXT)")
+
+        # Results that are obtained with a different Tag enumeration cannot be used.
+        tags_fingerprint = _tags_fingerprint()
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'tags'").fetchone()
+        if row is None or row[0] != tags_fingerprint:
+            self.clear()
+            self._connection.execute("INSERT OR REPLACE INTO meta VALUES ('tags', ?)",
+                                     (tags_fingerprint,))
+            self._connection.commit()
+        self._n_entries = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if self._n_entries > self.max_entries:
+            self._evict()
+            self.flush()
+
+    def comprises(self, scenario_category: ScenarioCategory, scenario: Scenario) -> bool:
+        """ Check if the scenario category comprises the given scenario.
+
+        The result is the same as ScenarioCategory.comprises().
+
+        :param scenario_category: The scenario category.
+        :param scenario: The scenario that is potentially comprised.
+        :return: Whether or not the scenario is comprised.
+        """
+        check_for_type("scenario_category", scenario_category, ScenarioCategory)
+        check_for_type("scenario", scenario, Scenario)
+        return self.lookup(scenario_category.derived_tags(), scenario.derived_tags())
+
+    def includes(self, scenario_category: ScenarioCategory,
+                 other_category: ScenarioCategory) -> bool:
+        """ Check if the scenario category includes the given scenario category.
+
+        The result is the same as ScenarioCategory.includes().
+
+        :param scenario_category: The scenario category.
+        :param other_category: The scenario category that is potentially
+            included.
+        :return: Whether or not the other scenario category is included.
+        """
+        check_for_type("scenario_category", scenario_category, ScenarioCategory)
+        check_for_type("other_category", other_category, ScenarioCategory)
+        return self.lookup(scenario_category.derived_tags(), other_category.derived_tags())
+
+    def lookup(self, own_tags: DerivedTags, other_tags: DerivedTags) -> bool:
+        """ Check whether all derived tags are present in other derived tags.
+
+        If the result is not yet stored, it is computed and stored.
+
+        :param own_tags: The derived tags of the scenario category.
+        :param other_tags: The derived tags of the scenario or of the scenario
+            category that is potentially included.
+        :return: Whether the scenario (category) is comprised (included).
+        """
+        key = (own_tags.fingerprint(), other_tags.fingerprint())
+        row = self._connection.execute("SELECT result FROM results WHERE own = ? AND other = ?",
+                                       key).fetchone()
+        if row is not None:
+            self.hits += 1
+            self._last_used[key] = time.time()
+            if len(self._last_used) >= _COMMIT_INTERVAL:
+                self.flush()
+            return bool(row[0])
+
+        self.misses += 1
+        result = _comprises_tags(own_tags, other_tags)
+        self._connection.execute("INSERT INTO results VALUES (?, ?, ?, ?)",
+                                 key + (int(result), time.time()))
+        self._n_entries += 1
+        if self._n_entries > self.max_entries:
+            self._evict()
+        self._n_pending += 1
+        if self._n_pending >= _COMMIT_INTERVAL or \
+                time.time() - self._last_flush >= _COMMIT_SECONDS:
+            self.flush()
+        return result
+
+    def flush(self) -> None:
+        """ Write the new results and the times at which results are used to disk. """
+        self._write_last_used()
+        self._connection.commit()
+        self._n_pending = 0
+        self._last_flush = time.time()
+
+    def _write_last_used(self) -> None:
+        self._connection.executemany("UPDATE results SET last_used = ? WHERE own = ? AND " +
+                                     "other = ?", [(last_used,) + key for key, last_used
+                                                   in self._last_used.items()])
+        self._last_used.clear()
+
+    def clear(self) -> None:
+        """ Remove all stored results. """
+        self._last_used.clear()
+        self._connection.execute("DELETE FROM results")
+        self.flush()
+        self._n_entries = 0
+
+    def close(self) -> None:
+        """ Write the results to disk and close the database. """
+        self.flush()
+        self._connection.close()
+
+    def _evict(self) -> None:
+        # Remove the least recently used results. A few more results are removed than strictly
+        # needed, such that this is not done again for each new result.
+        n_remove = self._n_entries - self.max_entries * 9 // 10
+        self._write_last_used()
+        self._connection.execute("DELETE FROM results WHERE rowid IN (SELECT rowid FROM results " +
+                                 "ORDER BY last_used LIMIT ?)", (n_remove,))
+        self._n_entries -= n_remove
+
+    def __len__(self) -> int:
+        return self._n_entries
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _tags_fingerprint() -> str:
+    """ Return a hash of the Tag enumeration, including the supertags of each Tag.
+
+    :return: Hexadecimal string with the hash.
+    """
+    content = [[tag.name, sorted(supertag.name for supertag in tag.ancestors())] for tag in Tag]
+    return hashlib.sha1(repr(content).encode()).hexdigest()
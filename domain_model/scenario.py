@@ -22,20 +22,43 @@ Modifications:
 2020 10 05: Change way of creating object from JSON code.
 2020 10 12: Remove Dynamic/StaticPhysicalThing and use PhysicalElement instead.
 2020 10 15: Add function get_actor_by_name.
+2026 10 16: The derived tags are stored as TagSet.
+2026 10 16: Cache the derived tags until the scenario or one of its attributes changes.
+2026 10 16: Return the derived tags as DerivedTags.
+2026 10 16: Use an index of the acts for evaluating states and for finding actors by name.
+2026 10 16: Dispatch the time instants to the activities using the sorted start times.
+2026 10 16: Add sample() for evaluating multiple actors and state variables at once.
+2026 10 16: Add get_state_chunks() for evaluating long scenarios with bounded memory.
+2026 10 16: Use the trajectory cache (if enabled) in get_state() and get_state_dot().
+2026 10 16: Add get_state_integral(), e.g., for obtaining the position from the speed.
+2026 10 16: Add get_trajectories() for reconstructing 2D trajectories of the actors.
 """
 
-from typing import Callable, List, Tuple, Union
+from typing import Callable, Iterator, List, Tuple, Union
 import numpy as np
 from .activity import Activity, _activity_from_json
 from .actor import Actor, _actor_from_json
+from .derived_tags import DerivedTags
 from .physical_element import PhysicalElement, _physical_element_from_json
-from .scenario_category import derive_actor_tags, _check_acts, _print_tags, _get_acts
+from .scenario_category import _derive_actor_tags, _check_acts, _print_tags, _get_acts, \
+    _index_acts, _tag_sources, _ActIndex, _cache_key
 from .scenario_element import DMObjects, _attributes_from_json, _object_from_json
 from .state_variable import StateVariable
+from .tags import TagSet
 from .time_interval import TimeInterval, _time_interval_props_from_json
+from .trajectory_cache import get_trajectory_cache, _grid_fingerprint
 from .type_checking import check_for_list, check_for_tuple
 
 
+# For state variables of which the integral is another state variable, the initial value of the
+# integral is obtained from the initial states of the actor.
+_INTEGRALS = {StateVariable.SPEED: StateVariable.LONGITUDINAL_POSITION,
+              StateVariable.YAWRATE: StateVariable.HEADING}
+
+# The schemes for integrating the velocity in get_trajectories().
+_SCHEMES = ("euler", "trapezoidal", "simpson")
+
+
 class Scenario(TimeInterval):
     """ Scenario - either a real-world scenario or a test case.
 
@@ -76,6 +99,8 @@ class Scenario(TimeInterval):
         self.actors = []                   # Type: List[Actor]
         self.activities = []               # Type: List[Activity]
         self.acts = []                     # Type: List[Tuple(Actor, Activity)]
+        self._derived_tags = None          # Type: Tuple[int, DerivedTags]
+        self._act_index = None             # Type: Tuple[int, _ActIndex]
 
         # Set attributes if provided by kwargs.
         if "physical_elements" in kwargs:
@@ -99,6 +124,7 @@ class Scenario(TimeInterval):
 
         # Assign physical elements to an attribute.
         self.physical_elements = physical_elements
+        self._changed()
 
     def set_activities(self, activities: List[Activity]) -> None:
         """ Set the activities.
@@ -113,6 +139,7 @@ class Scenario(TimeInterval):
 
         # Assign actitivies to an attribute.
         self.activities = activities  # Type: List[Activity]
+        self._changed()
 
     def set_actors(self, actors: List[Actor]) -> None:
         """ Set the actors.
@@ -127,6 +154,7 @@ class Scenario(TimeInterval):
 
         # Assign actors to an attribute.
         self.actors = actors  # Type: List[Actor]
+        self._changed()
 
     def set_acts(self, acts_scenario: List[Tuple[Actor, Activity]], verbose: bool = True) -> None:
         """ Set the acts
@@ -152,45 +180,78 @@ class Scenario(TimeInterval):
         # Check whether the actors/activities defined with the acts are already listed. If not,
         # the corresponding actor/activity will be added and a warning will be shown.
         _check_acts(self.acts, self.actors, self.activities, verbose=verbose)
+        self._changed()
 
-    def derived_tags(self) -> dict:
+    def derived_tags(self) -> DerivedTags:
         """ Return all tags, including the tags of the attributes.
 
         The Scenario has tags, but also its attributes can have tags. More
         specifically, each PhysicalElement, each Actor, and each Activity might
-        have tags. A dictionary will be returned. Each item of the dictionary
-        contains a list of tags corresponding to either the own object (i.e.,
-        Scenario), an Actor, or an PhysicalElement.
+        have tags. A DerivedTags object will be returned, which contains a
+        TagSet with the tags corresponding to either the own object (i.e.,
+        Scenario), an Actor, or an PhysicalElement. It can also be used as a
+        dictionary, where each key is formatted as <name>::<class>.
 
         The tags that might be associated with the Activity are returned with
         the Actor if the corresponding Actor is performing that Activity
         according to the defined acts.
 
-        :return: List of tags.
-        """
-        # Instantiate the dictionary.
-        tags = {}
-
-        # Provide the tags of the very own object (Scenario).
-        if self.tags:
-            tags["{:s}::Scenario".format(self.name)] = self.tags
-
-        # Provide the tags for each Actor.
-        tags = derive_actor_tags(self.actors, self.acts, tags=tags)
+        The result is cached. It is only computed again if the name or the tags
+        of the scenario or of one of its attributes (or their categories) have
+        changed, if any of the set_* methods is used, or if elements are added
+        to (or removed from) the lists of attributes. Replacing an element of
+        one of these lists is not noticed, so use the set_* methods instead.
 
-        # Provide the tags for each PhysicalElement.
-        for physical_element in self.physical_elements:
-            if physical_element.get_tags():
-                tags["{:s}::PhysicalElement".format(physical_element.name)] = \
-                    physical_element.get_tags()
-
-        # Return the tags.
+        :return: The derived tags.
+        """
+        if self._derived_tags is not None and self._derived_tags[0] == self._cache_key():
+            return self._derived_tags[1]
+
+        # Provide the tags of the very own object (Scenario), the tags for each Actor, and the
+        # tags for each PhysicalElement.
+        physical_elements = [(physical_element.name, TagSet(physical_element.get_tags()))
+                             for physical_element in self.physical_elements]
+        tags = DerivedTags(self.name, TagSet(self.tags),
+                           actors=[(actor.name, actor_tags) for actor, actor_tags in
+                                   _derive_actor_tags(self.actors, self.acts)],
+                           physical_elements=[(name, physical_element_tags)
+                                              for name, physical_element_tags in physical_elements
+                                              if physical_element_tags])
+
+        # Store the tags, such that they are only computed again if anything changes.
+        self._observe(_tag_sources(self.actors, self.acts, self.physical_elements))
+        self._derived_tags = (self._cache_key(), tags)
         return tags
 
     def print_tags(self) -> None:
         """ Print the derived tags. """
         print(_print_tags(self.derived_tags()))
 
+    def get_activities_by_actor(self, actor: Actor, state: StateVariable = None) -> List[Activity]:
+        """ Get the activities that the actor performs according to the acts.
+
+        An index of the acts is used, which is updated when the actors or the
+        acts are set, or when an actor is renamed.
+
+        :param actor: The actor.
+        :param state: If given, only activities with this state variable are
+            returned.
+        :return: List with the activities, in the order of the acts.
+        """
+        if state is None:
+            return list(self._get_act_index().activities.get(actor, []))
+        return list(self._get_act_index().activities_by_state.get((actor, state), []))
+
+    def _get_act_index(self) -> _ActIndex:
+        if self._act_index is None or self._act_index[0] != self._cache_key():
+            self._observe(self.actors)
+            self._act_index = (self._cache_key(), _index_acts(self.actors, self.acts))
+        return self._act_index[1]
+
+    def _cache_key(self) -> tuple:
+        return _cache_key(self._version, self.physical_elements, self.actors, self.activities,
+                          self.acts)
+
     def get_state(self, actor: Actor, state: StateVariable, time: Union[float, List, np.ndarray]) \
             -> Union[None, float, np.ndarray]:
         """ Obtain the values of the state variable at the given time instants.
@@ -214,40 +275,272 @@ class Scenario(TimeInterval):
         """
         return self._get_state(actor, state, time, derivative=True)
 
+    def get_state_integral(self, actor: Actor, state: StateVariable,
+                           time: Union[float, List, np.ndarray], initial_value: float = None) \
+            -> Union[None, float, np.ndarray]:
+        """ Obtain the integral of the state variable at the given time instants.
+
+        The integral starts at the start of the first activity of the actor for
+        the state variable. The integrals of the consecutive activities are
+        computed analytically (see Activity.get_state_integral()) and chained,
+        so, e.g., the position can be obtained from the speed at any time
+        instant without evaluating the speed on a fine grid.
+
+        The initial value of the integral is `initial_value`. If it is not
+        provided, it is obtained from the initial states of the actor: the
+        longitudinal position for the speed and the heading for the yaw rate.
+        If there is no such initial state, the initial value is 0.
+
+        Each activity is used from its start until the next activity starts
+        (or until its end, if that comes earlier). If there is a time instant
+        that is not covered by any activity, the integral at that time instant
+        and all later time instants is NaN.
+
+        :param actor: The actor of which the state variable is to be integrated.
+        :param state: The state variable that is to be integrated.
+        :param time: The time instance(s).
+        :param initial_value: The value of the integral at the start of the
+            first activity.
+        :return: The value of the integral at the given time instants.
+        """
+        vec_time = self._time2vec(time)
+        activities, tstart, tend = self._get_intervals(actor, state)
+        if not activities:
+            return None
+        if initial_value is None:
+            initial_value = _initial_value(actor, _INTEGRALS.get(state), 0)
+
+        # Each activity lasts until the next activity starts. After a gap, the integral is unknown.
+        order = np.argsort(tstart, kind="stable")
+        activities = [activities[i] for i in order]
+        tstart, tend = tstart[order], np.minimum(tend[order], np.append(tstart[order][1:], np.inf))
+        gaps = np.flatnonzero(tend[:-1] < tstart[1:])
+        if len(gaps):
+            activities, tstart, tend = activities[:gaps[0]+1], tstart[:gaps[0]+1], tend[:gaps[0]+1]
+
+        # The integral at the start of each activity.
+        offsets = np.cumsum([initial_value] +
+                            [activity.get_state_integral(time=activity_tend)[0]
+                             for activity, activity_tend in zip(activities[:-1], tend[:-1])])
+
+        values = np.ones(len(vec_time)) * np.nan
+        index = np.searchsorted(tstart, vec_time, side="right") - 1
+        covered = index >= 0
+        covered[covered] = vec_time[covered] <= tend[index[covered]]
+        index[~covered] = len(activities)
+        order = np.argsort(index, kind="stable")
+        bounds = np.searchsorted(index[order], np.arange(len(activities) + 1))
+        for activity, offset, start, end in zip(activities, offsets, bounds[:-1], bounds[1:]):
+            if start < end:
+                samples = order[start:end]
+                values[samples] = offset + activity.get_state_integral(time=vec_time[samples])
+        if isinstance(time, (float, int)):
+            return values[0]
+        return values
+
+    def get_trajectories(self, step: float = 0.1, tstart: float = None, tend: float = None,
+                         actors: List[Actor] = None, scheme: str = "trapezoidal") \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """ Reconstruct the 2D trajectories of the actors from their speed and heading.
+
+        The velocity of each actor, i.e., the speed in the direction of the
+        heading, is integrated to obtain the position (x, y) at equidistant time
+        instants. The initial position is obtained from the initial states of
+        the actor (StateVariable.LONGITUDINAL_POSITION and
+        StateVariable.LATERAL_POSITION), 0 if these are not provided.
+
+        The heading is obtained from the activities with StateVariable.HEADING.
+        If the actor has none, the heading is the integral of the yaw rate (see
+        get_state_integral()), starting from the initial heading. If the actor
+        has neither, the initial heading (0 if not provided) is used. Likewise,
+        if the actor has no activities with StateVariable.SPEED, the initial
+        speed is used. If the speed or heading is unknown at a time instant, the
+        position is NaN from that time instant on.
+
+        The states of all actors are evaluated at once (see sample()) and the
+        positions are computed with array operations, using one of the
+        following schemes:
+         - euler: the velocity at the start of each step is used.
+         - trapezoidal: the average velocity at the start and end of each step
+           is used (default).
+         - simpson: Simpson's rule, which also evaluates the velocity halfway
+           each step.
+
+        :param step: The time between two consecutive time instants.
+        :param tstart: The first time instant. By default, the start time.
+        :param tend: The last time instant. By default, the end time.
+        :param actors: The actors. By default, all actors of the scenario.
+        :param scheme: The integration scheme: "euler", "trapezoidal", or
+            "simpson".
+        :return: The time instants and an array with the x-position, the
+            y-position, and the heading, with shape (number of actors, 3,
+            number of time instants).
+        """
+        if scheme not in _SCHEMES:
+            raise ValueError("Scheme '{:s}' is not valid, use one of {}.".format(scheme, _SCHEMES))
+        if actors is None:
+            actors = self.actors
+
+        # For Simpson's rule, the states are also evaluated halfway each step.
+        n_substeps = 2 if scheme == "simpson" else 1
+        time = self._time_grid(step, tstart, tend, n_substeps=n_substeps)
+
+        states = [StateVariable.SPEED, StateVariable.HEADING]
+        values = self.sample(time, actors=actors, states=states)
+        initial = np.array([[_initial_value(actor, state, 0.) for state in
+                             [StateVariable.LONGITUDINAL_POSITION, StateVariable.LATERAL_POSITION,
+                              StateVariable.SPEED, StateVariable.HEADING]] for actor in actors])
+        activities_by_state = self._get_act_index().activities_by_state
+        for i, actor in enumerate(actors):
+            if (actor, StateVariable.SPEED) not in activities_by_state:
+                values[i, 0] = initial[i, 2]
+            if (actor, StateVariable.HEADING) not in activities_by_state:
+                heading = self.get_state_integral(actor, StateVariable.YAWRATE, time,
+                                                  initial_value=initial[i, 3])
+                values[i, 1] = initial[i, 3] if heading is None else heading
+
+        # Integrate the velocity.
+        velocity = values[:, :1] * np.stack((np.cos(values[:, 1]), np.sin(values[:, 1])), axis=1)
+        if scheme == "euler":
+            delta = velocity[:, :, :-1] * step
+        elif scheme == "trapezoidal":
+            delta = (velocity[:, :, :-1] + velocity[:, :, 1:]) / 2 * step
+        else:
+            delta = (velocity[:, :, :-2:2] + 4*velocity[:, :, 1::2] + velocity[:, :, 2::2]) / \
+                6 * step
+        trajectories = np.empty((len(actors), 3, delta.shape[2] + 1))
+        trajectories[:, :2, 0] = initial[:, :2]
+        np.cumsum(delta, axis=2, out=trajectories[:, :2, 1:])
+        trajectories[:, :2, 1:] += initial[:, :2, np.newaxis]
+        trajectories[:, 2] = values[:, 1, ::n_substeps]
+        return time[::n_substeps], trajectories
+
+    def get_state_chunks(self, actor: Actor, state: StateVariable, rate: float,
+                         tstart: float = None, tend: float = None, chunk_size: int = 10000,
+                         derivative: bool = False) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """ Evaluate a state variable at equidistant time instants, in chunks.
+
+        For long scenarios, evaluating the state at a high rate results in large
+        arrays. Instead, this generator yields the time instants and the values
+        of the state variable (or its derivative) in chunks of at most
+        `chunk_size` time instants, such that only one chunk is in memory at a
+        time. The activities of the actor are only looked up once.
+
+        If no activity covers a time instant, the value is NaN. Note that this
+        is different from get_state(), which returns None if none of the time
+        instants is covered.
+
+        :param actor: The actor of which the state variable is to be retrieved.
+        :param state: The state variable that is to be retrieved.
+        :param rate: Number of time instants per second.
+        :param tstart: The first time instant. By default, the start time.
+        :param tend: The last time instant. By default, the end time.
+        :param chunk_size: Maximum number of time instants per chunk.
+        :param derivative: Whether to evaluate the derivative.
+        :return: Generator of tuples with the time instants and the values.
+        """
+        activities, activity_tstart, activity_tend = self._get_intervals(actor, state)
+
+        # The shape of the values is needed for chunks without any activity.
+        value_shape = ()
+        if activities:
+            value_shape = _evaluate_activities(activities[:1], activity_tstart[:1],
+                                               activity_tend[:1], activity_tstart[:1],
+                                               derivative=derivative).shape[1:]
+
+        for time in self._time_chunks(rate, tstart=tstart, tend=tend, chunk_size=chunk_size):
+            values = _evaluate_activities(activities, activity_tstart, activity_tend, time,
+                                          derivative=derivative)
+            if values is None:
+                values = np.full((len(time),) + value_shape, np.nan)
+            yield time, values
+
+    def sample(self, time: Union[float, List, np.ndarray], actors: List[Actor] = None,
+               states: List[StateVariable] = None, derivative: bool = False,
+               out: np.ndarray = None) -> np.ndarray:
+        """ Evaluate the state variables of multiple actors at the given time instants.
+
+        The result is the same as calling get_state() (or get_state_dot()) for
+        each combination of an actor and a state variable, but all values are
+        stored in one array. If an actor has no activity for a state variable
+        at a time instant, the value is NaN.
+
+        To avoid allocating a new array, e.g., when sampling many scenarios,
+        an array can be provided with `out`. The values are then written to
+        this array.
+
+        :param time: The time instant(s).
+        :param actors: The actors. By default, all actors of the scenario.
+        :param states: The state variables. By default, all state variables for
+            which the actors perform activities (except for
+            StateVariable.MESSAGE), in the order of StateVariable.
+        :param derivative: Whether to evaluate the derivatives instead.
+        :param out: Array of floats in which the values are stored, with shape
+            (number of actors, number of state variables, number of time
+            instants).
+        :return: Array with the values, with shape (number of actors, number of
+            state variables, number of time instants).
+        """
+        vec_time = self._time2vec(time)
+        if actors is None:
+            actors = self.actors
+        if states is None:
+            activities_by_state = self._get_act_index().activities_by_state
+            states = [state for state in StateVariable if state != StateVariable.MESSAGE and
+                      any((actor, state) in activities_by_state for actor in actors)]
+
+        shape = (len(actors), len(states), len(vec_time))
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape or not np.issubdtype(out.dtype, np.floating):
+            raise ValueError("Array <out> should contain floats and its shape should be " +
+                             "{}, but it has shape {}.".format(shape, out.shape))
+        out.fill(np.nan)
+
+        for i, actor in enumerate(actors):
+            for j, state in enumerate(states):
+                _evaluate_activities(*self._get_intervals(actor, state), vec_time,
+                                     derivative=derivative, out=out[i, j])
+        return out
+
     def _get_state(self, actor: Actor, state: StateVariable, time: Union[float, List, np.ndarray],
                    derivative=False) -> Union[None, float, np.ndarray]:
         vec_time = self._time2vec(time)
-        is_valid = False
-
-        # Loop through the acts.
-        for my_actor, my_activity in self.acts:
-            # Only continue with right actor and activity.
-            if my_actor == actor and my_activity.category.state == state:
-                tstart = my_activity.get_tstart()
-                tend = my_activity.get_tend()
-                if tstart is None or tend is None:
-                    continue
-                # Check if the time span contains time instances that we want to evaluate.
-                mask = np.logical_and(vec_time >= tstart, vec_time <= tend)
-                if np.any(mask):
-                    if not derivative:
-                        tmp_values = my_activity.get_state(time=vec_time[mask])
-                    else:
-                        tmp_values = my_activity.get_state_dot(time=vec_time[mask])
-                    if not is_valid:
-                        if len(tmp_values.shape) == 1:
-                            values = np.ones(len(vec_time)) * np.nan
-                        else:
-                            values = np.ones((len(vec_time), tmp_values.shape[0])) * np.nan
-                        is_valid = True
-                    values[mask] = tmp_values.T
-
-        if not is_valid:
+        intervals = self._get_intervals(actor, state)
+        cache = get_trajectory_cache()
+        if cache is None:
+            values = _evaluate_activities(*intervals, vec_time, derivative=derivative)
+        else:
+            key = ("scenario", derivative, _grid_fingerprint(vec_time),
+                   tuple(activity._cache_key()  # pylint: disable=protected-access
+                         for activity in intervals[0]))
+            values = cache.get(key, lambda: _evaluate_activities(*intervals, vec_time,
+                                                                 derivative=derivative))
+        if values is None:
             return None
         if isinstance(time, (float, int)):
             return values[0]
         return values
 
+    def _get_intervals(self, actor: Actor, state: StateVariable) \
+            -> Tuple[List[Activity], np.ndarray, np.ndarray]:
+        """ Obtain the activities of an actor for a state variable and their time intervals.
+
+        Activities without start time or end time are left out.
+
+        :param actor: The actor.
+        :param state: The state variable.
+        :return: The activities, in the order of the acts, and arrays with the
+            start times and the end times of the activities.
+        """
+        intervals = [(activity, activity.get_tstart(), activity.get_tend()) for activity in
+                     self._get_act_index().activities_by_state.get((actor, state), [])]
+        intervals = [interval for interval in intervals
+                     if interval[1] is not None and interval[2] is not None]
+        return ([activity for activity, _, _ in intervals],
+                np.array([tstart for _, tstart, _ in intervals], dtype=float),
+                np.array([tend for _, _, tend in intervals], dtype=float))
+
     @staticmethod
     def _time2vec(time: Union[float, List, np.ndarray]) -> np.ndarray:
         if isinstance(time, (float, int)):
@@ -271,10 +564,7 @@ class Scenario(TimeInterval):
         :param name: The name of the actor that is to be returned.
         :return: The actor with the given name.
         """
-        for actor in self.actors:
-            if actor.name == name:
-                return actor
-        return None
+        return self._get_act_index().actors_by_name.get(name)
 
     def to_json(self) -> dict:
         scenario = TimeInterval.to_json(self)
@@ -286,9 +576,7 @@ class Scenario(TimeInterval):
         scenario["acts"] = []
         for actor, activity in self.acts:
             scenario["acts"].append({"actor": actor.uid, "activity": activity.uid})
-        scenario["derived_tags"] = self.derived_tags()
-        for key, tags in scenario["derived_tags"].items():
-            scenario["derived_tags"][key] = [tag.to_json() for tag in tags]
+        scenario["derived_tags"] = self.derived_tags().to_json()
         return scenario
 
     def to_json_full(self) -> dict:
@@ -301,6 +589,90 @@ class Scenario(TimeInterval):
         return scenario
 
 
+def _initial_value(actor: Actor, state: StateVariable, default: float) -> float:
+    """ Obtain the initial value of a state variable of an actor.
+
+    :param actor: The actor.
+    :param state: The state variable.
+    :param default: The value that is returned if there is no such initial
+        state.
+    :return: The initial value.
+    """
+    for initial_state in actor.initial_states:
+        if initial_state.state_variable == state:
+            return initial_state.value[0]
+    return default
+
+
+def _evaluate_activities(activities: List[Activity], tstart: np.ndarray, tend: np.ndarray,
+                         vec_time: np.ndarray, derivative: bool = False,
+                         out: np.ndarray = None) -> Union[None, np.ndarray]:
+    """ Evaluate the state (or its derivative) using the activities that cover the time instants.
+
+    If the time intervals of multiple activities contain a time instant, the
+    activity that comes last is used. Usually, the activities follow each
+    other, i.e., both the start times and the end times are sorted. In that
+    case, each time instant is assigned to the last activity that starts
+    before (or at) that time instant using a binary search. The time instants
+    are then grouped per activity, such that each activity is only evaluated
+    once. Hence, the computation time scales with the number of time instants
+    (and logarithmically with the number of activities).
+
+    :param activities: The activities.
+    :param tstart: The start times of the activities.
+    :param tend: The end times of the activities.
+    :param vec_time: The time instants.
+    :param derivative: Whether to evaluate the derivative of the state.
+    :param out: If given, the values are written to this array. Note that the
+        values at time instants that are not covered are not changed.
+    :return: The values at the time instants (NaN if no activity covers a time
+        instant), or None if none of the time instants is covered and `out` is
+        not given.
+    """
+    values = out
+    if np.all(np.diff(tstart) >= 0) and np.all(np.diff(tend) >= 0):
+        index = np.searchsorted(tstart, vec_time, side="right") - 1
+        covered = index >= 0
+        covered[covered] = vec_time[covered] <= tend[index[covered]]
+        index[~covered] = len(activities)
+
+        # Group the time instants per activity. If the time instants are sorted, each group is a
+        # contiguous part of the time instants.
+        order = np.argsort(index, kind="stable")
+        bounds = np.searchsorted(index[order], np.arange(len(activities) + 1))
+        for activity, start, end in zip(activities, bounds[:-1], bounds[1:]):
+            if start < end:
+                values = _set_activity_values(values, activity, vec_time, order[start:end],
+                                              derivative)
+        return values
+
+    # In case activities overlap in another way, all activities need to be checked for each time.
+    for activity, activity_tstart, activity_tend in zip(activities, tstart, tend):
+        mask = np.logical_and(vec_time >= activity_tstart, vec_time <= activity_tend)
+        if np.any(mask):
+            values = _set_activity_values(values, activity, vec_time, mask, derivative)
+    return values
+
+
+def _set_activity_values(values: Union[None, np.ndarray], activity: Activity,
+                         vec_time: np.ndarray, samples: np.ndarray, derivative: bool) -> np.ndarray:
+    # The activity is evaluated without the trajectory cache, because only the result for the
+    # scenario is stored.
+    tmp_values = activity._evaluate(None, vec_time[samples],  # pylint: disable=protected-access
+                                    derivative)
+    if values is None:
+        if len(tmp_values.shape) == 1:
+            values = np.ones(len(vec_time)) * np.nan
+        else:
+            values = np.ones((len(vec_time), tmp_values.shape[0])) * np.nan
+    elif len(tmp_values.shape) != len(values.shape):
+        raise ValueError("Activity with name '{:s}' returns a state ".format(activity.name) +
+                         "with {:d} dimension(s), ".format(len(tmp_values.shape)) +
+                         "while {:d} dimension(s) are expected.".format(len(values.shape)))
+    values[samples] = tmp_values.T
+    return values
+
+
 def _scenario_props_from_json(json: dict, attribute_objects: DMObjects, **kwargs) -> dict:
     props = _time_interval_props_from_json(json, attribute_objects,
                                            start=None if "start" not in kwargs else kwargs["start"],
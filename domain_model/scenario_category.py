@@ -24,19 +24,30 @@ Modifications:
 2020 08 25: Add comprises() function.
 2020 10 04: Change way of creating object from JSON code.
 2020 10 12: Remove Dynamic/StaticPhysicalThing and use PhysicalElement instead.
+2026 10 16: The derived tags are stored as TagSet, such that tags can be compared using bitmasks.
+2026 10 16: Add classify() and includes_matrix() for checking many (pairs of) objects at once.
+2026 10 16: Match actors and physical elements using Hopcroft-Karp instead of a greedy heuristic.
+2026 10 16: Cache the derived tags until the scenario category or one of its attributes changes.
+2026 10 16: Add function to obtain the derived tags from JSON code.
+2026 10 16: Compare encoded derived tags, such that classify() can use multiple processes.
+2026 10 16: Return the derived tags as DerivedTags, such that the groups are directly available.
+2026 10 16: Add an index of the acts, such that the activities of an actor are found directly.
 """
 
 from __future__ import annotations
-from typing import List, Tuple, Union
-import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Tuple, Union
 import numpy as np
 from .activity import Activity
 from .activity_category import ActivityCategory, _activity_category_from_json
 from .actor import Actor
 from .actor_category import ActorCategory, _actor_category_from_json
+from .derived_tags import DerivedTags, derived_tags_from_json
 from .physical_element_category import PhysicalElementCategory, _physical_element_category_from_json
 from .qualitative_element import QualitativeElement, _qualitative_element_props_from_json
-from .scenario_element import DMObjects, _attributes_from_json, _object_from_json
+from .scenario_element import DMObjects, ScenarioElement, _attributes_from_json, _object_from_json
+from .state_variable import StateVariable
+from .tags import TagSet
 from .type_checking import check_for_type, check_for_list, check_for_tuple
 
 
@@ -91,6 +102,8 @@ class ScenarioCategory(QualitativeElement):
         self.physical_elements = []  # Type: List[PhysicalElementCategory]
         self.actors = []  # Type: List[ActorCategory]
         self.acts = []  # Type: List[Tuple[ActorCategory, ActivityCategory]]
+        self._derived_tags = None  # Type: Tuple[int, DerivedTags]
+        self._act_index = None  # Type: Tuple[int, _ActIndex]
 
         # Set attributes if provided by kwargs.
         if "physical_element_categories" in kwargs:
@@ -121,6 +134,7 @@ class ScenarioCategory(QualitativeElement):
 
         # Assign static physical thing categories to an attribute.
         self.physical_elements = physical_elements
+        self._changed()
 
     def set_activities(self, activity_categories: List[ActivityCategory]) -> None:
         """ Set the activities
@@ -136,6 +150,7 @@ class ScenarioCategory(QualitativeElement):
 
         # Assign activity categories to an attribute.
         self.activities = activity_categories  # Type: List[ActivityCategory]
+        self._changed()
 
     def set_actors(self, actor_categories: List[ActorCategory]) -> None:
         """ Set the actors
@@ -151,6 +166,7 @@ class ScenarioCategory(QualitativeElement):
 
         # Assign actor categories to an attribute.
         self.actors = actor_categories  # Type: List[ActorCategory]
+        self._changed()
 
     def set_acts(self, acts_scenario_category: List[Tuple[ActorCategory, ActivityCategory]],
                  verbose: bool = True) -> None:
@@ -175,41 +191,75 @@ class ScenarioCategory(QualitativeElement):
         # Set the acts.
         self.acts = acts_scenario_category
         _check_acts(self.acts, self.actors, self.activities, verbose=verbose)
+        self._changed()
 
-    def derived_tags(self) -> dict:
+    def derived_tags(self) -> DerivedTags:
         """ Return all tags, including the tags of the attributes.
 
         The ScenarioCategory has tags, but also its attributes can have tags.
         More specifically, the each PhysicalElementCategory, ActorCategory, and
-        ActivityCategory might have tags. A dictionary will be returned. Each
-        item of the dictionary contains a list of tags corresponding to either
-        the own object (i.e., ScenarioCategory), a PhysicalElementCategory, or
-        an ActorCategory.
+        ActivityCategory might have tags. A DerivedTags object will be returned,
+        which contains a TagSet with the tags corresponding to either the own
+        object (i.e., ScenarioCategory), a PhysicalElementCategory, or an
+        ActorCategory. It can also be used as a dictionary, where each key is
+        formatted as <name>::<class>.
 
         The tags that might be associated with the ActivityCategory are returned
         with the ActorCategory if the corresponding ActorCategory is performing
         that ActivityCategory according to the defined acts.
 
-        :return: List of tags.
+        The result is cached. It is only computed again if the name or the tags
+        of the scenario category or of one of its attributes have changed, if
+        any of the set_* methods is used, or if elements are added to (or
+        removed from) the lists of attributes. Replacing an element of one of
+        these lists is not noticed, so use the set_* methods instead.
+
+        :return: The derived tags.
         """
-        # Instantiate the dictionary.
-        tags = {}
+        if self._derived_tags is not None and self._derived_tags[0] == self._cache_key():
+            return self._derived_tags[1]
+
+        # Provide the tags of the very own object (ScenarioCategory), the tags for each
+        # ActorCategory, and the tags for each PhysicalElementCategory.
+        tags = DerivedTags(self.name, TagSet(self.tags),
+                           actors=[(actor.name, actor_tags) for actor, actor_tags in
+                                   _derive_actor_tags(self.actors, self.acts)],
+                           physical_elements=[(physical_element.name,
+                                               TagSet(physical_element.tags))
+                                              for physical_element in self.physical_elements
+                                              if physical_element.tags],
+                           qualitative=True)
+
+        # Store the tags, such that they are only computed again if anything changes.
+        self._observe(_tag_sources(self.actors, self.acts, self.physical_elements))
+        self._derived_tags = (self._cache_key(), tags)
+        return tags
 
-        # Provide the tags of the very own object (ScenarioCategory).
-        if self.tags:
-            tags["{:s}::ScenarioCategory".format(self.name)] = self.tags
+    def get_activities_by_actor(self, actor_category: ActorCategory,
+                                state: StateVariable = None) -> List[ActivityCategory]:
+        """ Get the activity categories that the actor category performs according to the acts.
 
-        # Provide the tags for each ActorCategory.
-        tags = derive_actor_tags(self.actors, self.acts, tags=tags)
+        An index of the acts is used, which is updated when the actor
+        categories or the acts are set, or when an actor category is renamed.
 
-        # Provide the tags for each PhysicalElementCategory.
-        for physical_element in self.physical_elements:
-            if physical_element.tags:
-                tags["{:s}::PhysicalElementCategory".format(physical_element.name)] = \
-                    physical_element.tags
+        :param actor_category: The actor category.
+        :param state: If given, only activity categories with this state
+            variable are returned.
+        :return: List with the activity categories, in the order of the acts.
+        """
+        if state is None:
+            return list(self._get_act_index().activities.get(actor_category, []))
+        return list(self._get_act_index().activities_by_state.get((actor_category, state), []))
 
-        # Return the tags.
-        return tags
+    def _get_act_index(self) -> _ActIndex:
+        if self._act_index is None or self._act_index[0] != self._cache_key():
+            self._observe(self.actors)
+            self._act_index = (self._cache_key(), _index_acts(self.actors, self.acts))
+        return self._act_index[1]
+
+    def _cache_key(self) -> tuple:
+        return _cache_key(self._version, self.physical_elements, self.actors, self.activities,
+                          self.acts)
 
     def includes(self, scenario_category: ScenarioCategory) -> bool:
         """ Check if this scenario category includes the given scenario category
@@ -223,20 +273,7 @@ class ScenarioCategory(QualitativeElement):
             included in this scenario category.
         :return: Whether or not the ScenarioCategory is included.
         """
-        # Determine the derived tags of this and the other scenario category.
-        own_tags = self.derived_tags()
-        other_tags = scenario_category.derived_tags()
-
-        # Check for tags directly related to the ScenarioCategory. These tags should be directly
-        # present for the scenario.
-        if not _check_tags(own_tags, other_tags, "ScenarioCategory", "ScenarioCategory"):
-            return False
-
-        # Check for the actors, dynamic physical things, and static physical things.
-        if not _check_multiple_tags(own_tags, other_tags, "ActorCategory") or \
-                not _check_multiple_tags(own_tags, other_tags, "PhysicalElementCategory"):
-            return False
-        return True
+        return _comprises_tags(self.derived_tags(), scenario_category.derived_tags())
 
     def comprises(self, scenario) -> bool:
         """ Check if this scenario category comprises the given scenario
@@ -250,21 +287,7 @@ class ScenarioCategory(QualitativeElement):
             included in this scenario category.
         :return: Whether or not the ScenarioCategory is included.
         """
-        # Determine the derived tags of this and the other scenario category.
-        own_tags = self.derived_tags()
-        other_tags = scenario.derived_tags()
-
-        # Check for tags directly related to the ScenarioCategory. These tags should be directly
-        # present for the scenario.
-        if not _check_tags(own_tags, other_tags, "ScenarioCategory", "Scenario"):
-            return False
-
-        # Check for the actors, dynamic physical things, and static physical things.
-        if not _check_multiple_tags(own_tags, other_tags, "ActorCategory", "Actor") or \
-                not _check_multiple_tags(own_tags, other_tags, "PhysicalElementCategory",
-                                         "PhysicalElement"):
-            return False
-        return True
+        return _comprises_tags(self.derived_tags(), scenario.derived_tags())
 
     def __str__(self) -> str:
         """ Method that will be called when printing the scenario category.
@@ -305,9 +328,7 @@ class ScenarioCategory(QualitativeElement):
         for actor, activity in self.acts:
             scenario_category["acts"].append({"actor": actor.uid,
                                               "activity": activity.uid})
-        scenario_category["derived_tags"] = self.derived_tags()
-        for key, tags in scenario_category["derived_tags"].items():
-            scenario_category["derived_tags"][key] = [tag.to_json() for tag in tags]
+        scenario_category["derived_tags"] = self.derived_tags().to_json()
         return scenario_category
 
     def to_json_full(self) -> dict:
@@ -321,6 +342,60 @@ class ScenarioCategory(QualitativeElement):
         return scenario_category
 
 
+def _tag_sources(actors: List, acts: List, physical_elements: List) -> List[ScenarioElement]:
+    """ Return all elements of which the tags are used for the derived tags.
+
+    :param actors: The actors of the Scenario(Category).
+    :param acts: The acts of the Scenario(Category).
+    :param physical_elements: The physical elements of the Scenario(Category).
+    :return: The actors, activities, and physical elements, and their categories.
+    """
+    elements = actors + [activity for _, activity in acts] + physical_elements
+    return elements + [element.category for element in elements
+                       if isinstance(getattr(element, "category", None), ScenarioElement)]
+
+
+# Index of the acts of a Scenario(Category), see _index_acts().
+_ActIndex = NamedTuple("_ActIndex", [("activities", Dict[ScenarioElement, List]),
+                                     ("activities_by_state",
+                                      Dict[Tuple[ScenarioElement, StateVariable], List]),
+                                     ("actors_by_name", Dict[str, ScenarioElement])])
+
+
+def _index_acts(actors: List, acts: List) -> _ActIndex:
+    """ Index the acts of a Scenario(Category).
+
+    :param actors: The actors of the Scenario(Category).
+    :param acts: The acts of the Scenario(Category).
+    :return: For each actor, the activities that it performs; for each actor
+        and state variable, the activities that it performs with that state
+        variable; and for each name, the first actor with that name.
+    """
+    index = _ActIndex(dict(), dict(), dict())
+    for actor in actors:
+        index.actors_by_name.setdefault(actor.name, actor)
+    for actor, activity in acts:
+        index.activities.setdefault(actor, []).append(activity)
+        state = activity.category.state if isinstance(activity, Activity) else activity.state
+        index.activities_by_state.setdefault((actor, state), []).append(activity)
+    return index
+
+
+def _cache_key(version: int, *attributes: List) -> tuple:
+    """ Return the key of a cached result of a Scenario(Category).
+
+    Adding elements to (or removing elements from) the lists of attributes
+    without using the set_* methods, e.g., scenario.actors.append(actor), does
+    not change the version. Therefore, the identity and the length of these
+    lists are part of the key.
+
+    :param version: The version of the Scenario(Category).
+    :param attributes: The lists of attributes, e.g., the actors and the acts.
+    :return: The key.
+    """
+    return (version,) + tuple((id(elements), len(elements)) for elements in attributes)
+
+
 def _check_acts(acts: Union[List[Tuple[ActorCategory, ActivityCategory]],
                             List[Tuple[Actor, Activity]]],
                 actors: Union[List[ActorCategory], List[Actor]],
@@ -328,19 +403,23 @@ def _check_acts(acts: Union[List[Tuple[ActorCategory, ActivityCategory]],
                 verbose: bool = True):
     # Check whether the actors/activities defined with the acts are already listed. If not,
     # the corresponding actor/activity will be added and a warning will be shown.
+    known_actors = set(actors)
+    known_activities = set(activities)
     for thing, activity in acts:
-        if thing not in actors:
+        if thing not in known_actors:
             if verbose:
                 print("Actor with name '{:s}' ".format(thing.name) +
                       "is used with acts but not defined in the list of actors.")
                 print("Therefore, the actor is added to the list of actors.")
             actors.append(thing)
-        if activity not in activities:
+            known_actors.add(thing)
+        if activity not in known_activities:
             if verbose:
                 print("Activity with name '{:s}' is used with acts but".format(activity.name) +
                       " not defined in the list of activities.")
                 print("Therefore, the activity is added to the list of activities.")
             activities.append(activity)
+            known_activities.add(activity)
 
 
 def _scenario_category_props_from_json(json: dict, attribute_objects: DMObjects, **kwargs) -> dict:
@@ -388,13 +467,100 @@ def scenario_category_from_json(json: dict, attribute_objects: DMObjects = None,
                              attribute_objects, **kwargs)
 
 
+def classify(scenario_categories: List[ScenarioCategory], scenarios: List,
+             n_processes: int = 1, chunk_size: int = 1000) -> np.ndarray:
+    """ Determine which scenarios are comprised by which scenario categories.
+
+    The result is the same as calling ScenarioCategory.comprises() for each
+    combination of a scenario category and a scenario, but the derived tags of
+    each scenario category and each scenario are only computed once.
+
+    If multiple processes are used, the scenarios are split into chunks of
+    `chunk_size` scenarios and each chunk is classified in a separate process.
+    Only a compact encoding of the derived tags (a few integers per actor and
+    physical element) is sent to the processes, not the objects themselves.
+    The result does not depend on the number of processes or the chunk size.
+
+    :param scenario_categories: The M scenario categories.
+    :param scenarios: The N scenarios.
+    :param n_processes: Number of processes. Use None for the number of CPUs.
+    :param chunk_size: Number of scenarios that are sent at once to a process.
+    :return: M-by-N boolean array, where the (i,j)-th element is True if the
+        i-th scenario category comprises the j-th scenario.
+    """
+    return _membership_matrix([category.derived_tags().encode()
+                               for category in scenario_categories],
+                              [scenario.derived_tags().encode() for scenario in scenarios],
+                              n_processes=n_processes, chunk_size=chunk_size)
+
+
+def includes_matrix(scenario_categories: List[ScenarioCategory],
+                    other_categories: List[ScenarioCategory] = None, n_processes: int = 1,
+                    chunk_size: int = 1000) -> np.ndarray:
+    """ Determine which scenario categories include which scenario categories.
+
+    The result is the same as calling ScenarioCategory.includes() for each
+    combination of scenario categories, but the derived tags of each scenario
+    category are only computed once. See classify() for the use of multiple
+    processes.
+
+    :param scenario_categories: The M scenario categories.
+    :param other_categories: The N scenario categories that are potentially
+        included. By default, the same scenario categories are used.
+    :param n_processes: Number of processes. Use None for the number of CPUs.
+    :param chunk_size: Number of scenario categories that are sent at once to a
+        process.
+    :return: M-by-N boolean array, where the (i,j)-th element is True if the
+        i-th scenario category includes the j-th (other) scenario category.
+    """
+    own_tags = [category.derived_tags().encode() for category in scenario_categories]
+    if other_categories is None:
+        other_tags = own_tags
+    else:
+        other_tags = [category.derived_tags().encode() for category in other_categories]
+    return _membership_matrix(own_tags, other_tags, n_processes=n_processes,
+                              chunk_size=chunk_size)
+
+
+def _membership_matrix(own_tags: List[tuple], other_tags: List[tuple], n_processes: int = 1,
+                       chunk_size: int = 1000) -> np.ndarray:
+    if n_processes == 1 or len(other_tags) <= chunk_size:
+        return _membership_chunk(other_tags, own_tags)
+
+    chunks = [other_tags[i:i+chunk_size] for i in range(0, len(other_tags), chunk_size)]
+    with ProcessPoolExecutor(max_workers=n_processes, initializer=_set_own_tags,
+                             initargs=(own_tags,)) as executor:
+        # The results of map() are in the same order as the chunks.
+        results = list(executor.map(_membership_chunk, chunks))
+    return np.concatenate(results, axis=1)
+
+
+_OWN_TAGS = []  # type: List[tuple]
+
+
+def _set_own_tags(own_tags: List[tuple]) -> None:
+    # The tags of the scenario categories are only sent once to each process.
+    global _OWN_TAGS  # pylint: disable=global-statement
+    _OWN_TAGS = own_tags
+
+
+def _membership_chunk(other_tags: List[tuple], own_tags: List[tuple] = None) -> np.ndarray:
+    if own_tags is None:
+        own_tags = _OWN_TAGS
+    membership = np.zeros((len(own_tags), len(other_tags)), dtype=bool)
+    for i, tags in enumerate(own_tags):
+        for j, subtags in enumerate(other_tags):
+            membership[i, j] = _comprises_encoded(tags, subtags)
+    return membership
+
+
 def derive_actor_tags(actors: List, acts: List, tags: dict = None) -> dict:
     """ Derive the tags that are associated with the actors.
 
     The tags of an Actor(Category) will be added to the dictionary "tags". The
     key equals <name of actor>::<class>, where class is supposed to be either
     Actor or ActorCategory, whereas the value will be the list of tags that are
-    associated with the actor.
+    associated with the actor. The tags are stored in a TagSet.
 
     :param actors: The actors of  the Scenario(Category).
     :param acts: The acts of the Scenario(Category).
@@ -406,123 +572,186 @@ def derive_actor_tags(actors: List, acts: List, tags: dict = None) -> dict:
     if tags is None:
         tags = {}
 
-    for actor in actors:
-        actor_tags = actor.get_tags()
-        for act in acts:
-            if act[0] == actor:
-                actor_tags += act[1].get_tags()
-        if actor_tags:
-            if isinstance(actor, ActorCategory):
-                class_name = "ActorCategory"
-            elif isinstance(actor, Actor):
-                class_name = "Actor"
-            else:
-                raise TypeError("Actor is of type '{}' while it should be ".format(type(actor)) +
-                                "of type ActorCategory, or Actor.")
-            key = "{:s}::{:s}".format(actor.name, class_name)
-            i = 1
-            while key in tags:  # Make sure that a unique key is used.
-                i += 1
-                key = "{:s}{:d}::{:s}".format(actor.name, i, class_name)
-            tags[key] = list(set(actor_tags))  # list(set()) makes sure that tags are unique.
+    for actor, actor_tags in _derive_actor_tags(actors, acts):
+        class_name = "ActorCategory" if isinstance(actor, ActorCategory) else "Actor"
+        key = "{:s}::{:s}".format(actor.name, class_name)
+        i = 1
+        while key in tags:  # Make sure that a unique key is used.
+            i += 1
+            key = "{:s}{:d}::{:s}".format(actor.name, i, class_name)
+        tags[key] = actor_tags
     return tags
 
 
-def _check_tags(tags: dict, subtags: dict, tags_class: str = "ScenarioCategory",
-                subtags_class: str = "ScenarioCategory") -> bool:
-    """ Check whether (sub)tags of <tags> are present in <subtags>.
+def _derive_actor_tags(actors: List, acts: List) \
+        -> List[Tuple[Union[ActorCategory, Actor], TagSet]]:
+    """ Derive the tags that are associated with the actors.
 
-    The tags are provided as dictionaries, where each item corresponds to the
-    tags of one object that is part of the scenario (category). This function
-    checks whether all tags in <tags> of the class <tags_class> are present in
-    the tags in <subtags> of the class <subtags_class> (or subtags of the
-    <tags>).
+    The tags of an actor are its own tags and the tags of the activities that
+    it performs according to the acts. Actors without tags are skipped.
 
-    :param tags: Dictionary of the derived tags of the ScenarioCategory.
-    :param subtags: Dictionary of the derived tags of the Scenario.
-    :param tags_class: Specify attribute to be used of the ScenarioCategory.
-    :param subtags_class: Specify attribute to be used of the Scenario.
-    :return: Whether the tags of the ScenarioCategory are found in the tags
-        of the Scenario.
+    :param actors: The actors of the Scenario(Category).
+    :param acts: The acts of the Scenario(Category).
+    :return: List with each actor and its TagSet.
+    """
+    activity_tags = dict()
+    for actor, activity in acts:
+        activity_tags.setdefault(actor, []).extend(activity.get_tags())
+
+    actor_tags = []
+    for actor in actors:
+        if not isinstance(actor, (ActorCategory, Actor)):
+            raise TypeError("Actor is of type '{}' while it should be ".format(type(actor)) +
+                            "of type ActorCategory, or Actor.")
+        tags = actor.get_tags() + activity_tags.get(actor, [])
+        if tags:
+            actor_tags.append((actor, TagSet(tags)))
+    return actor_tags
+
+
+def _comprises_tags(own_tags: DerivedTags, other_tags: DerivedTags) -> bool:
+    """ Check whether all derived tags of a scenario category are present in other derived tags.
+
+    :param own_tags: The derived tags of the scenario category.
+    :param other_tags: The derived tags of the scenario or of the scenario
+        category that is potentially included.
+    :return: Whether the scenario (category) is comprised (included).
     """
-    sc_keys = fnmatch.filter(tags, "*::{:s}".format(tags_class))
-    if sc_keys:  # In this case, there are tags in <tags> related to <tags_class>.
-        s_keys = fnmatch.filter(subtags, "*::{:s}".format(subtags_class))
-        if s_keys:  # There are tags in <subtags> related to <subtags_class>.
-            for tag in tags[sc_keys[0]]:
-                if not any(map(tag.is_supertag_of, subtags[s_keys[0]])):
-                    return False  # A tag of <tags> is not found in the <subtags>.
-        else:  # There are no tags in <subtags> related to <subtags_class>.
-            return False
-    return True
-
-
-def _check_multiple_tags(own_tags: dict, other_tags: dict, tags_class: str,
-                         subtags_class: str = None) -> bool:
-    """ Check if all tags in `own_tags` are present in `other_tags`.
+    return _comprises_encoded(own_tags.encode(), other_tags.encode())
+
+
+def _comprises_encoded(own_tags: tuple, other_tags: tuple) -> bool:
+    """ Check whether all encoded tags of a scenario category are present in other encoded tags.
+
+    :param own_tags: The encoded derived tags of the scenario category.
+    :param other_tags: The encoded derived tags of the scenario (category).
+    :return: Whether the scenario (category) is comprised (included).
+    """
+    # Check for tags directly related to the ScenarioCategory. These tags should be directly
+    # present for the scenario.
+    if own_tags[0][0] & ~other_tags[0][1]:
+        return False
+
+    # Check for the actors and the physical elements.
+    return _check_multiple_tags(own_tags[1], other_tags[1]) and \
+        _check_multiple_tags(own_tags[2], other_tags[2])
+
+
+def _check_multiple_tags(own_objects: Tuple[Tuple[int, int], ...],
+                         other_objects: Tuple[Tuple[int, int], ...]) -> bool:
+    """ Check if all tags in `own_objects` are present in `other_objects`.
 
     This is done for a specific attribute (e.g., actor_categories). For example,
-    with actor categories, there is a list made, where each item is a list
-    itself with the tags of the corresponding actor category. For each the
-    actor category in <own_tags>, there needs to be a (different) actor category
-    in <other_tags> that has the same tags (or more tags, or corresponding
+    with actor categories, there is a list made, where each item contains the
+    encoded tags of the corresponding actor category. For each the actor
+    category in <own_objects>, there needs to be a (different) actor category
+    in <other_objects> that has the same tags (or more tags, or corresponding
     subtags).
 
-    :param own_tags: The tags of the own scenario category.
-    :param other_tags: The tags of the scenario category that is potentially
-        'included' in the former.
-    :param tags_class: Check for which attribute we need to check.
-    :param subtags_class: If specified, this class is used for the `other_tags`.
-    :return: True if all tags in `own_tags` are present in `other_tags`.
+    :param own_objects: The encoded tags of the objects of the own scenario
+        category.
+    :param other_objects: The encoded tags of the objects of the scenario
+        (category) that is potentially 'comprised' ('included').
+    :return: True if all tags in `own_objects` are present in `other_objects`.
     """
-    if subtags_class is None:
-        subtags_class = tags_class
-    own_objects = fnmatch.filter(own_tags, "*::{:s}".format(tags_class))
-    other_objects = fnmatch.filter(other_tags, "*::{:s}".format(subtags_class))
     if len(own_objects) > len(other_objects):  # There must be equal or more objects in other SC.
         return False
 
-    # Create a boolean matrix, where the (i,j)-th element is True if the i-th object of the other
-    # objects might correspond to the j-th object of our own objects.
-    match = np.zeros((len(other_objects), len(own_objects)), dtype=np.bool)
-    for i, other_object in enumerate(other_objects):
-        for j, own_object in enumerate(own_objects):
-            match[i, j] = all(any(map(tag.is_supertag_of, other_tags[other_object]))
-                              for tag in own_tags[own_object])
-
-    # Check if all of our own objects can be matched with the actos in the other objects.
-    return _check_match_matrix(match)
-
-
-def _check_match_matrix(match: np.array) -> bool:
-    # The matching of the actors need to be done. If a match is found, the corresponding
-    # row and column will be removed from the match matrix.
-    n_matches = 1  # Number of matches to look for.
-    while match.size:
-        # If there is at least one ActorCategory left that has no match, a False will be
-        # returned.
-        if not all(np.any(match, axis=1)):
-            return False
-
-        sum_match_actor = np.sum(match, axis=0)
-        j = next((j for j in range(match.shape[1]) if sum_match_actor[j] == n_matches), -1)
-        if j >= 0:  # We found an actor of our own scenario category with n matches.
-            i = next(i for i in range(match.shape[0]) if match[i, j])
-        else:
-            sum_match_actor = np.sum(match, axis=1)
-            i = next((i for i in range(match.shape[0]) if sum_match_actor[i] == n_matches), -1)
-            if i >= 0:  # We found an actor of the ScenarioCategory with n matches
-                j = next(j for j in range(match.shape[1]) if match[i, j])
-            else:
-                # Try again for higher n (number of matches)
-                n_matches = n_matches + 1
-                continue
-        match = np.delete(np.delete(match, i, axis=0), j, axis=1)
-        n_matches = 1
-    return True
+    # For each of our own objects, create a bitset, where the i-th bit is set if the i-th object of
+    # the other objects might correspond to our own object.
+    adjacency = [sum(1 << i for i, (_, closure) in enumerate(other_objects) if not mask & ~closure)
+                 for mask, _ in own_objects]
+
+    # Check if all of our own objects can be matched with the objects in the other objects.
+    return _has_complete_matching(adjacency, len(other_objects))
+
+
+def _has_complete_matching(adjacency: List[int], n_right: int) -> bool:
+    """ Check if each left vertex of a bipartite graph can be matched to a different right vertex.
 
+    The Hopcroft-Karp algorithm is used to compute a maximum matching, which
+    takes O(E sqrt(V)) time, where E is the number of edges and V is the number
+    of vertices. The edges are provided as bitsets: the j-th bit of
+    `adjacency[i]` is set if the i-th left vertex can be matched with the j-th
+    right vertex.
 
-def _print_tags(derived_tags: dict) -> str:
+    :param adjacency: For each left vertex, the bitset of its neighbors.
+    :param n_right: The number of right vertices.
+    :return: True if the maximum matching contains all left vertices.
+    """
+    n_left = len(adjacency)
+    if n_left > n_right or not all(adjacency):
+        return False
+    neighbors = [_bit_indices(bitset) for bitset in adjacency]
+    match_left = [-1] * n_left
+    match_right = [-1] * n_right
+    unreachable = n_left + 1
+    size = 0
+
+    while True:
+        # Breadth-first search from the unmatched left vertices, which divides the left vertices
+        # in layers. `free_layer` is the length of the shortest augmenting paths.
+        layer = [unreachable] * n_left
+        queue = [i for i in range(n_left) if match_left[i] < 0]
+        for i in queue:
+            layer[i] = 0
+        free_layer = unreachable
+        for i in queue:  # The queue grows while iterating over it.
+            if layer[i] >= free_layer:
+                continue
+            for j in neighbors[i]:
+                k = match_right[j]
+                if k < 0:
+                    free_layer = min(free_layer, layer[i] + 1)
+                elif layer[k] == unreachable:
+                    layer[k] = layer[i] + 1
+                    queue.append(k)
+        if free_layer == unreachable:
+            return size == n_left
+
+        # Depth-first search for vertex-disjoint shortest augmenting paths.
+        for i in range(n_left):
+            if match_left[i] < 0 and _augment(i, neighbors, match_left, match_right, layer,
+                                              free_layer):
+                size += 1
+
+
+def _augment(i: int, neighbors: List[List[int]], match_left: List[int], match_right: List[int],
+             layer: List[int], free_layer: int) -> bool:
+    """ Search for a shortest augmenting path from a left vertex and use it to extend the matching.
+
+    See _has_complete_matching().
+
+    :param i: The left vertex.
+    :param neighbors: For each left vertex, the indices of its neighbors.
+    :param match_left: For each left vertex, the matched right vertex (or -1).
+    :param match_right: For each right vertex, the matched left vertex (or -1).
+    :param layer: For each left vertex, the layer of the breadth-first search.
+    :param free_layer: The length of the shortest augmenting paths.
+    :return: Whether an augmenting path is found.
+    """
+    for j in neighbors[i]:
+        k = match_right[j]
+        if (k < 0 and layer[i] + 1 == free_layer) or \
+                (k >= 0 and layer[k] == layer[i] + 1 and
+                 _augment(k, neighbors, match_left, match_right, layer, free_layer)):
+            match_left[i] = j
+            match_right[j] = i
+            return True
+    layer[i] = len(layer) + 1  # No augmenting path via this vertex in this phase (unreachable).
+    return False
+
+
+def _bit_indices(bitset: int) -> List[int]:
+    indices = []
+    while bitset:
+        lowest_bit = bitset & -bitset
+        indices.append(lowest_bit.bit_length() - 1)
+        bitset ^= lowest_bit
+    return indices
+
+
+def _print_tags(derived_tags: DerivedTags) -> str:
     string = "Tags:\n"
     for i, (key, tags) in enumerate(derived_tags.items(), start=1):
         string += u"{}\u2500 {:s}\n".format(u"\u2514" if i == len(derived_tags) else u"\u251C", key)
@@ -541,3 +770,12 @@ def _get_acts(json, actors, activities):
         acts.append((actors[actor_uids.index(act["actor"])],
                      activities[activity_uids.index(act["activity"])]))
     return acts
+
+
+def _derived_tags_from_json(json: dict) -> DerivedTags:
+    """ Obtain the derived tags from the JSON code of a Scenario(Category).
+
+    :param json: JSON code of the Scenario or ScenarioCategory.
+    :return: The derived tags, similar to the output of derived_tags().
+    """
+    return derived_tags_from_json(json["derived_tags"])
@@ -16,11 +16,13 @@ Modifications:
 2020 10 04: Provide functions for creating objects from JSON code.
 2020 10 12: Remove Static/DynamicPhysicalThing(Category), add PhysicalElement(Category) to objects.
 2020 10 25: Change name of Thing to ScenarioElement.
+2026 10 16: Keep track of changes of the name and the tags, such that derived tags can be cached.
 """
 
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, NamedTuple, Tuple, Union
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple, Union
 import uuid
+import weakref
 from .tags import Tag, tag_from_json
 from .type_checking import check_for_type, check_for_list
 
@@ -34,6 +36,12 @@ class ScenarioElement(ABC):
     is an abstract class, so it is not possible to instantiate objects from this
     class.
 
+    Each change of the name or the tags (including changes of the list of tags
+    itself, e.g., using append()) increases the version of the element. Other
+    elements that use the name or the tags, e.g., for deriving tags, can
+    observe this element and their version is increased as well, such that they
+    know when their cached results are outdated.
+
     Attributes:
         uid (int): A unique ID.
         name (str): A name that serves as a short description of the actor
@@ -49,6 +57,8 @@ class ScenarioElement(ABC):
         check_for_type("name", name, str)
         check_for_list("tags", tags, Tag)
 
+        self._version = 0
+        self._observers = weakref.WeakSet()  # Elements that need to know if this element changes.
         if uid is None:
             self.uid = uuid.uuid4().int  # type: int
         else:
@@ -56,6 +66,56 @@ class ScenarioElement(ABC):
         self.name = name  # type: str
         self.tags = [] if tags is None else tags
 
+    @property
+    def name(self) -> str:
+        """ The name of the element. """
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self._name = name
+        self._changed()
+
+    @property
+    def tags(self) -> List[Tag]:
+        """ The tags of the element. """
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: List[Tag]) -> None:
+        self._tags = _TagList(self, tags)
+        self._changed()
+
+    def _changed(self) -> None:
+        """ Increase the version of this element and of the elements observing it. """
+        self._version += 1
+        for observer in list(self._observers):
+            observer._changed()  # pylint: disable=protected-access
+
+    def _observe(self, elements: Iterable["ScenarioElement"]) -> None:
+        """ Make sure that the version of this element increases if one of the elements changes.
+
+        :param elements: The elements that are to be observed.
+        """
+        for element in elements:
+            element._observers.add(self)  # pylint: disable=protected-access
+
+    def __getstate__(self) -> dict:
+        # Weak references cannot be copied and cached results might become outdated, because the
+        # observed elements are not observed anymore after copying.
+        state = self.__dict__.copy()
+        state["_tags"] = list(self._tags)
+        del state["_observers"]
+        for cache in ("_derived_tags", "_act_index"):
+            if cache in state:
+                state[cache] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._observers = weakref.WeakSet()
+        self._tags = _TagList(self, self._tags)
+
     def get_tags(self) -> List[Tag]:
         """ Return the list of tags related to this Object.
 
@@ -94,6 +154,39 @@ class ScenarioElement(ABC):
         return self.to_json()
 
 
+class _TagList(list):
+    """ List of tags that notifies the element that owns the list when it is changed. """
+    def __init__(self, owner: ScenarioElement, tags: Iterable[Tag]):
+        list.__init__(self, tags)
+        self._owner = owner
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _notifying(method_name: str, base: type = list, callback: str = "_changed") -> Callable:
+    """ Wrap a method of `base`, such that the owner is notified after calling the method.
+
+    :param method_name: The name of the method.
+    :param base: The class of which the method is wrapped.
+    :param callback: The name of the method of the owner that is called.
+    :return: The wrapped method.
+    """
+    method = getattr(base, method_name)
+
+    def _method(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        getattr(self._owner, callback)()
+        return result
+    _method.__name__ = method_name
+    return _method
+
+
+for _method_name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+                     "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(_TagList, _method_name, _notifying(_method_name))
+
+
 def _scenario_element_props_from_json(json: dict) -> dict:
     return dict(name=json["name"],
                 uid=int(json["id"]),
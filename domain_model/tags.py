@@ -14,9 +14,12 @@ Modifications:
 2018 12 10: Region tags added.
 2019 11 04: Add str() around tag.name as to avoid Pylint from complaining.
 2020 07 31: Change is_subtag to is_supertag_of to make it more descriptive.
+2026 10 16: Precompute the supertag relation, add descendants() and ancestors().
+2026 10 16: Add TagSet, a set of tags that is stored as a bitmask.
 """
 
 from enum import Enum, unique
+from typing import Dict, FrozenSet, Iterable, Iterator, List
 
 
 # this is for compatibility with python3.5 in Azure, the unique decorator ensures enumerations
@@ -230,32 +233,167 @@ class Tag(Enum):
     def is_supertag_of(self, subtag) -> bool:
         """ Check whether the provided Tag is a subtag of the current Tag.
 
+        The relation is looked up in a table that is computed once when this
+        module is imported, see _supertag_table().
+
         :param subtag: The potential subtag.
         :return: True if the provided Tag is a "subtag", otherwise False.
         """
-        # If the subtag is the same, then it is regarding to also be a subtag.
-        if self == subtag:
-            return True
-
-        # If the subtag is exactly the same, but with more details, it is regarded to be a
-        # subtag. For example,
-        if len(subtag.name) > len(self.name) and subtag.name[:len(self.name)] == str(self.name):
-            return True
-
-        # In case the own Tag is a "RoadUserType_Vehicle", then there are many other
-        # RoadUserTypes that are regarded as "subtags" of "Vehicle".
-        if self == Tag.RoadUserType_Vehicle:
-            vehicle_tags = [Tag.RoadUserType_CategoryM_PassengerCar,
-                            Tag.RoadUserType_CategoryM_Bus,
-                            Tag.RoadUserType_CategoryM_Minibus,
-                            Tag.RoadUserType_CategoryN_LCV,
-                            Tag.RoadUserType_CategoryN_LGV,
-                            Tag.RoadUserType_CategoryL_Motorcycle,
-                            Tag.RoadUserType_CategoryL_Moped]
-            if subtag in vehicle_tags:
-                return True
-
-        return False
+        return subtag in _SUBTAGS[self]
+
+    def descendants(self) -> FrozenSet["Tag"]:
+        """ Return all subtags of the current Tag.
+
+        Note that a Tag is regarded to be a subtag of itself, so the returned
+        set always contains the current Tag.
+
+        :return: Set of all Tags for which is_supertag_of() returns True.
+        """
+        return _SUBTAGS[self]
+
+    def ancestors(self) -> FrozenSet["Tag"]:
+        """ Return all supertags of the current Tag.
+
+        Note that a Tag is regarded to be a supertag of itself, so the returned
+        set always contains the current Tag.
+
+        :return: Set of all Tags of which the current Tag is a subtag.
+        """
+        return _SUPERTAGS[self]
+
+
+# In case a Tag is a "RoadUserType_Vehicle", then there are many other RoadUserTypes that are
+# regarded as "subtags" of "Vehicle".
+_VEHICLE_TAGS = (Tag.RoadUserType_CategoryM_PassengerCar,
+                 Tag.RoadUserType_CategoryM_Bus,
+                 Tag.RoadUserType_CategoryM_Minibus,
+                 Tag.RoadUserType_CategoryN_LCV,
+                 Tag.RoadUserType_CategoryN_LGV,
+                 Tag.RoadUserType_CategoryL_Motorcycle,
+                 Tag.RoadUserType_CategoryL_Moped)
+
+
+def _is_supertag_of(supertag: Tag, subtag: Tag) -> bool:
+    # If the subtag is the same, then it is regarding to also be a subtag.
+    if supertag == subtag:
+        return True
+
+    # If the subtag is exactly the same, but with more details, it is regarded to be a
+    # subtag. For example, "RoadUserType_VRU_Pedestrian" is a subtag of "RoadUserType_VRU".
+    if len(subtag.name) > len(supertag.name) and subtag.name.startswith(supertag.name):
+        return True
+
+    # Vehicle categories are subtags of "RoadUserType_Vehicle".
+    return supertag == Tag.RoadUserType_Vehicle and subtag in _VEHICLE_TAGS
+
+
+def _supertag_table() -> Dict[Tag, FrozenSet[Tag]]:
+    """ Compute, for each Tag, the set of its subtags.
+
+    :return: Dictionary with each Tag as key and the set of subtags as value.
+    """
+    return {supertag: frozenset(subtag for subtag in Tag if _is_supertag_of(supertag, subtag))
+            for supertag in Tag}
+
+
+_SUBTAGS = _supertag_table()  # type: Dict[Tag, FrozenSet[Tag]]
+_SUPERTAGS = {subtag: frozenset(supertag for supertag in Tag if subtag in _SUBTAGS[supertag])
+              for subtag in Tag}  # type: Dict[Tag, FrozenSet[Tag]]
+
+# Each Tag corresponds to one bit, based on the order of the enumeration. The "closure" mask of a
+# Tag has the bits set of all its supertags (including the Tag itself).
+_TAGS = list(Tag)  # type: List[Tag]
+_BITS = {tag: 1 << i for i, tag in enumerate(_TAGS)}  # type: Dict[Tag, int]
+_CLOSURE_MASKS = {tag: sum(_BITS[supertag] for supertag in _SUPERTAGS[tag])
+                  for tag in _TAGS}  # type: Dict[Tag, int]
+
+
+class TagSet:
+    """ An immutable set of tags that is stored as a bitmask.
+
+    Each Tag corresponds to one bit of the integer `mask`. Next to the mask of
+    the tags, the "closure" can be obtained: the mask of all supertags of the
+    tags in the set. With the closure, it can be checked with a few bitwise
+    operations whether each tag of one TagSet has a subtag in another TagSet,
+    see is_supertag_of().
+
+    Iterating over a TagSet returns the tags in the order of the Tag
+    enumeration. When converting to JSON, a list with the names of the tags is
+    returned.
+
+    Attributes:
+        mask (int): Bitmask of the tags in the set.
+    """
+    __slots__ = ("mask", "_closure")
+
+    def __init__(self, tags: Iterable[Tag] = None, mask: int = 0):
+        if tags is not None:
+            for tag in tags:
+                mask |= _BITS[tag]
+        self.mask = mask  # type: int
+        self._closure = None
+
+    def closure(self) -> int:
+        """ Return the mask with all supertags of the tags in the set.
+
+        :return: The bitmask of the tags in the set and all their supertags.
+        """
+        if self._closure is None:
+            closure = 0
+            for tag in self:
+                closure |= _CLOSURE_MASKS[tag]
+            self._closure = closure
+        return self._closure
+
+    def is_supertag_of(self, subtags: "TagSet") -> bool:
+        """ Check whether each tag in this set has a subtag in the given set.
+
+        :param subtags: The TagSet with the potential subtags.
+        :return: True if all tags are supertags of at least one of the tags of
+            the provided TagSet.
+        """
+        return not self.mask & ~subtags.closure()
+
+    def to_json(self) -> List[str]:
+        """ When the TagSet is exporting to JSON, this function is being called
+
+        :return: List with the names of the tags.
+        """
+        return [tag.to_json() for tag in self]
+
+    def __iter__(self) -> Iterator[Tag]:
+        mask = self.mask
+        while mask:
+            lowest_bit = mask & -mask
+            yield _TAGS[lowest_bit.bit_length() - 1]
+            mask ^= lowest_bit
+
+    def __contains__(self, tag: Tag) -> bool:
+        return bool(self.mask & _BITS.get(tag, 0))
+
+    def __len__(self) -> int:
+        return bin(self.mask).count("1")
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __or__(self, other: "TagSet") -> "TagSet":
+        return TagSet(mask=self.mask | other.mask)
+
+    def __and__(self, other: "TagSet") -> "TagSet":
+        return TagSet(mask=self.mask & other.mask)
+
+    def __sub__(self, other: "TagSet") -> "TagSet":
+        return TagSet(mask=self.mask & ~other.mask)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TagSet) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        return "TagSet([{:s}])".format(", ".join(tag.name for tag in self))
 
 
 def tag_from_json(json: str) -> Tag:
@@ -270,6 +408,18 @@ def tag_from_json(json: str) -> Tag:
     return getattr(Tag, json)
 
 
+def tag_set_from_json(json: List[str]) -> TagSet:
+    """ Get TagSet object from JSON code
+
+    It is assumed that the JSON code of the TagSet is created using
+    TagSet.to_json().
+
+    :param json: JSON code of TagSet, which is a list of names of tags.
+    :return: TagSet object.
+    """
+    return TagSet(tag_from_json(tag) for tag in json)
+
+
 if __name__ == "__main__":
     # List all tags
     print("List of all tags:")
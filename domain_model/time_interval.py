@@ -6,10 +6,15 @@ Author(s): Erwin de Gelder
 Modifications:
 2020 08 24: Add functionality to obtain the start time, the end time, and the duration.
 2020 10 05: Change way of getting properties of the time interval.
+2026 10 16: Add function for generating the time instants of the time interval in chunks.
+2026 10 16: Add function for generating equidistant time instants with a given step.
+2026 10 16: Use the resolved time of events that are triggered by a condition.
+2026 10 16: Keep track of changes of the start and the end, such that resolved events are updated.
 """
 
 from abc import abstractmethod
-from typing import Union
+from typing import Iterator, Tuple, Union
+import numpy as np
 from .event import Event, _event_from_json
 from .quantitative_element import QuantitativeElement, _quantitative_element_props_from_json
 from .scenario_element import DMObjects, _attributes_from_json
@@ -47,6 +52,26 @@ class TimeInterval(QuantitativeElement):
         self.start = start
         self.end = end
 
+    @property
+    def start(self) -> Event:
+        """ The starting event. """
+        return self._start
+
+    @start.setter
+    def start(self, start: Event) -> None:
+        self._start = start
+        self._changed()
+
+    @property
+    def end(self) -> Event:
+        """ The end event. """
+        return self._end
+
+    @end.setter
+    def end(self, end: Event) -> None:
+        self._end = end
+        self._changed()
+
     def to_json(self) -> dict:
         time_interval = QuantitativeElement.to_json(self)
         time_interval["start"] = dict(uid=self.start.uid)
@@ -64,30 +89,79 @@ class TimeInterval(QuantitativeElement):
 
         :return: The start time - if it is available. Otherwise, None.
         """
-        try:
-            return self.start.conditions["time"]
-        except KeyError:
-            return None
+        return self.start.get_time()
 
     def get_tend(self) -> Union[float, None]:
         """ Obtain the end time (if it is available).
 
         :return: The end time - if it is available. Otherwise, None.
         """
-        try:
-            return self.end.conditions["time"]
-        except KeyError:
-            return None
+        return self.end.get_time()
 
     def get_duration(self) -> Union[float, None]:
         """ Obtain the duration (if it is available).
 
         :return: The duration - if it is available. Otherwise, None.
         """
-        try:
-            return self.end.conditions["time"] - self.start.conditions["time"]
-        except KeyError:
+        tstart, tend = self.get_tstart(), self.get_tend()
+        if tstart is None or tend is None:
             return None
+        return tend - tstart
+
+    def _time_chunks(self, rate: float, tstart: float = None, tend: float = None,
+                     chunk_size: int = 10000) -> Iterator[np.ndarray]:
+        """ Generate equidistant time instants in chunks.
+
+        The time instants start at `tstart` and go up to (and including)
+        `tend`. Only one chunk is in memory at a time.
+
+        :param rate: Number of time instants per second.
+        :param tstart: The first time instant. By default, the start time.
+        :param tend: The last time instant. By default, the end time.
+        :param chunk_size: Maximum number of time instants per chunk.
+        :return: Generator of arrays with the time instants.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size should be positive, but it is {}.".format(chunk_size))
+        tstart, n_instants = self._n_time_instants(rate, tstart, tend)
+        for i in range(0, n_instants, chunk_size):
+            yield tstart + np.arange(i, min(i + chunk_size, n_instants)) / rate
+
+    def _time_grid(self, step: float, tstart: float = None, tend: float = None,
+                   n_substeps: int = 1) -> np.ndarray:
+        """ Return equidistant time instants from `tstart` up to (and including) `tend`.
+
+        :param step: The time between two consecutive time instants.
+        :param tstart: The first time instant. By default, the start time.
+        :param tend: The last time instant. By default, the end time.
+        :param n_substeps: Number of substeps of each step, e.g., 2 for also
+            returning the time instants halfway each step.
+        :return: The time instants.
+        """
+        if step <= 0:
+            raise ValueError("Step should be positive, but it is {}.".format(step))
+        tstart, n_instants = self._n_time_instants(1 / step, tstart, tend)
+        return tstart + np.arange((n_instants - 1)*n_substeps + 1) * step / n_substeps
+
+    def _n_time_instants(self, rate: float, tstart: float = None, tend: float = None) \
+            -> Tuple[float, int]:
+        """ Return the first time instant and the number of equidistant time instants.
+
+        :param rate: Number of time instants per second.
+        :param tstart: The first time instant. By default, the start time.
+        :param tend: The last time instant. By default, the end time.
+        :return: The first time instant and the number of time instants up to
+            (and including) `tend`.
+        """
+        if rate <= 0:
+            raise ValueError("Rate should be positive, but it is {}.".format(rate))
+        tstart = self.get_tstart() if tstart is None else tstart
+        tend = self.get_tend() if tend is None else tend
+        if tstart is None or tend is None:
+            raise ValueError("Start time and end time need to be known or provided.")
+
+        # A small tolerance avoids that the end time is skipped due to rounding errors.
+        return tstart, max(int(np.floor((tend - tstart) * rate + 1e-9)) + 1, 0)
 
 
 def _time_interval_props_from_json(json: dict, attribute_objects: DMObjects, start: Event = None,
@@ -0,0 +1,170 @@
+""" Class TrajectoryCache
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Union
+import hashlib
+import numpy as np
+
+
+# The number of bytes that is counted for each stored result on top of the size of the array, e.g.,
+# for the key. Results that are not arrays, such as None, are counted with this size as well.
+_ENTRY_BYTES = 200
+
+
+class TrajectoryCache:
+    """ TrajectoryCache - a cache of evaluated states with a bounded size
+
+    Evaluating the same activity at the same time instants multiple times, e.g.,
+    for plotting and for computing metrics, gives the same result every time.
+    If the trajectory cache is enabled (see enable_trajectory_cache()), the
+    results of Activity.get_state(), Activity.get_state_dot(),
+    Scenario.get_state(), and Scenario.get_state_dot() are stored.
+
+    Each result is stored with a key that contains the uid of the activity
+    (or activities), the version of the parameters of the activity, the start
+    time and end time of the activity, and a fingerprint of the time instants.
+    The version of the parameters changes if the parameters are set or if the
+    parameters are changed using the methods of the dictionary, e.g.,
+    activity.parameters["xstart"] = 1. Note that changes of nested values,
+    e.g., a list inside the parameters, are not noticed.
+
+    The total size of the stored results is bounded by `max_bytes`. Each
+    result counts as the size of its array plus 200 bytes, such that also
+    results without an array, e.g., None, count. If more results are stored
+    or if `max_bytes` is lowered, the results that are least recently used are
+    removed.
+
+    Attributes:
+        max_bytes (int): Maximum total number of bytes of the stored results.
+        n_bytes (int): Total number of bytes of the stored results.
+        hits (int): Number of times that a stored result is used.
+        misses (int): Number of times that a result needed to be computed.
+    """
+    def __init__(self, max_bytes: int = 100 * 2**20):
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, Any]
+        self.max_bytes = max_bytes
+
+    @property
+    def max_bytes(self) -> int:
+        """ Maximum total number of bytes of the stored results. """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._remove_least_recently_used()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """ Return the stored result or compute (and store) the result.
+
+        A copy of the stored array is returned, such that the stored array
+        cannot be changed accidentally.
+
+        :param key: The key of the result.
+        :param compute: Function without arguments that computes the result.
+        :return: The result.
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return _copy(self._entries[key])
+
+        self.misses += 1
+        result = compute()
+        n_bytes = _n_bytes(result)
+        if n_bytes <= self.max_bytes:
+            self._entries[key] = _copy(result)
+            self.n_bytes += n_bytes
+            self._remove_least_recently_used()
+        return result
+
+    def _remove_least_recently_used(self) -> None:
+        while self.n_bytes > self.max_bytes:
+            _, removed = self._entries.popitem(last=False)
+            self.n_bytes -= _n_bytes(removed)
+
+    def clear(self) -> None:
+        """ Remove all stored results and reset the statistics. """
+        self._entries.clear()
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def statistics(self) -> Dict[str, int]:
+        """ Return the statistics of the cache.
+
+        :return: Dictionary with the number of hits and misses, the number of
+            stored results, and the total number of bytes of these results.
+        """
+        return dict(hits=self.hits, misses=self.misses, n_entries=len(self._entries),
+                    n_bytes=self.n_bytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_CACHE = None  # type: TrajectoryCache
+
+
+def enable_trajectory_cache(max_bytes: int = 100 * 2**20) -> TrajectoryCache:
+    """ Enable the cache of evaluated states.
+
+    If the cache is already enabled, the stored results are kept and only the
+    maximum size is updated. If the maximum size is lowered, the results that
+    are least recently used are removed.
+
+    :param max_bytes: Maximum total number of bytes of the stored results.
+    :return: The cache.
+    """
+    global _CACHE  # pylint: disable=global-statement
+    if _CACHE is None:
+        _CACHE = TrajectoryCache(max_bytes)
+    else:
+        _CACHE.max_bytes = max_bytes
+    return _CACHE
+
+
+def disable_trajectory_cache() -> None:
+    """ Disable the cache of evaluated states and remove all stored results. """
+    global _CACHE  # pylint: disable=global-statement
+    _CACHE = None
+
+
+def get_trajectory_cache() -> Union[TrajectoryCache, None]:
+    """ Return the cache of evaluated states.
+
+    :return: The cache, or None if the cache is not enabled.
+    """
+    return _CACHE
+
+
+def _grid_fingerprint(time: Union[None, float, List, np.ndarray], npoints: int = None) -> tuple:
+    """ Return a key that identifies the time instants.
+
+    :param time: The time instant(s).
+    :param npoints: The number of points, in case no time instants are given.
+    :return: Tuple that identifies the time instants.
+    """
+    if time is None:
+        return "npoints", npoints
+    if isinstance(time, (float, int)):
+        return "scalar", float(time)
+    time = np.ascontiguousarray(time, dtype=float)
+    return time.shape, hashlib.blake2b(time.tobytes(), digest_size=16).digest()
+
+
+def _n_bytes(result: Any) -> int:
+    return _ENTRY_BYTES + (result.nbytes if isinstance(result, np.ndarray) else 0)
+
+
+def _copy(result: Any) -> Any:
+    return result.copy() if isinstance(result, np.ndarray) else result
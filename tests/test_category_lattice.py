@@ -0,0 +1,41 @@
+""" Tests for the CategoryLattice class
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+import random
+from domain_model import ActorCategory, ActorType, CategoryLattice, ScenarioCategory, Tag
+
+# The tag of a vehicle is a supertag of the tags of a passenger car and a bus.
+_TAGS = (Tag.RoadUserType_Vehicle, Tag.RoadUserType_CategoryM_PassengerCar,
+         Tag.RoadUserType_CategoryM_Bus, Tag.RoadUserType_VRU_Pedestrian)
+
+
+def test_transitive_reduction():
+    """ The lattice contains an edge if and only if there is no path via another category. """
+    rng = random.Random(0)
+    for _ in range(20):
+        scenario_categories = []
+        for i in range(12):
+            actors = [ActorCategory(ActorType.Vehicle, name="actor{:d}".format(j),
+                                    tags=[rng.choice(_TAGS)])
+                      for j in range(rng.randint(0, 2))]
+            scenario_categories.append(ScenarioCategory("", name="category{:d}".format(i),
+                                                        actor_categories=actors))
+        lattice = CategoryLattice(scenario_categories)
+
+        # If two scenario categories include each other, the first one is regarded to include
+        # the other.
+        above = {(a.uid, b.uid) for i, a in enumerate(scenario_categories)
+                 for j, b in enumerate(scenario_categories)
+                 if i != j and a.includes(b) and (i < j or not b.includes(a))}
+        for a in scenario_categories:
+            children = {b.uid for b in scenario_categories if (a.uid, b.uid) in above and
+                        not any((a.uid, c.uid) in above and (c.uid, b.uid) in above
+                                for c in scenario_categories)}
+            assert lattice.children[a.uid] == children
+            for child in children:
+                assert a.uid in lattice.parents[child]
@@ -0,0 +1,63 @@
+""" Tests for the DocumentManagement class
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+import random
+from domain_model import Actor, ActorCategory, ActorType, DocumentManagement, Scenario, \
+    ScenarioCategory, Tag
+
+# The tag of a vehicle is a supertag of the tags of a passenger car and a bus.
+_TAGS = (Tag.RoadUserType_Vehicle, Tag.RoadUserType_CategoryM_PassengerCar,
+         Tag.RoadUserType_CategoryM_Bus, Tag.RoadUserType_VRU_Pedestrian)
+
+
+def _actor_categories(rng: random.Random):
+    return [ActorCategory(ActorType.Vehicle, name="actor{:d}".format(i), tags=[rng.choice(_TAGS)])
+            for i in range(rng.randint(0, 2))]
+
+
+def test_indices_after_delete():
+    """ The membership table and the tag index are the same as when they are built again. """
+    rng = random.Random(0)
+    document_management = DocumentManagement()
+    items = dict(scenario=dict(), scenario_category=dict())
+    for i in range(10):
+        scenario = Scenario(start=0, end=1, name="scenario{:d}".format(i))
+        scenario.set_actors([Actor(category, name=category.name)
+                             for category in _actor_categories(rng)])
+        scenario_category = ScenarioCategory("", name="category{:d}".format(i),
+                                             actor_categories=_actor_categories(rng))
+        for name, item in (("scenario", scenario), ("scenario_category", scenario_category)):
+            document_management.add_item(item)
+            items[name][item.uid] = item
+    document_management.get_membership()
+    document_management.get_candidate_scenarios(ScenarioCategory(""))
+
+    for _ in range(10):
+        name = rng.choice(("scenario", "scenario_category"))
+        uid = rng.choice(sorted(items[name]))
+        document_management.delete_item(name, uid)
+        del items[name][uid]
+
+        membership = {uid: sorted(category_uid for category_uid, category
+                                  in items["scenario_category"].items()
+                                  if category.comprises(scenario))
+                      for uid, scenario in items["scenario"].items()}
+        assert document_management.get_membership() == membership
+        for category_uid, category in items["scenario_category"].items():
+            assert document_management.get_comprised_scenarios(category) == \
+                sorted(uid for uid, categories in membership.items() if category_uid in categories)
+
+        # The tag index should be the same as the tag index of a new database.
+        new = DocumentManagement()
+        for scenario in items["scenario"].values():
+            new.add_item(scenario)
+        for tag in _TAGS:
+            scenario_category = ScenarioCategory("", actor_categories=[
+                ActorCategory(ActorType.Vehicle, tags=[tag])])
+            assert document_management.get_candidate_scenarios(scenario_category) == \
+                new.get_candidate_scenarios(scenario_category)
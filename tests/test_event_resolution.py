@@ -0,0 +1,97 @@
+""" Tests for resolving the time of events that are triggered by a condition
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from typing import Tuple
+import pytest
+from domain_model import Activity, ActivityCategory, Actor, ActorCategory, ActorType, Constant, \
+    Event, Linear, Scenario, State, StateVariable, resolve_event, resolve_events
+
+
+def _scenario(activity_category: ActivityCategory, parameters: dict, start: float,
+              condition: dict) -> Tuple[Scenario, Activity, Event]:
+    actor = Actor(ActorCategory(ActorType.Vehicle, name="vehicle"), name="ego")
+    activity = Activity(activity_category, parameters, start=start, end=10)
+    event = Event(conditions=dict(state_condition=dict(actor=actor.uid, **condition)))
+    triggered = Activity(ActivityCategory(Constant(), StateVariable.SPEED, name="speed"),
+                         dict(xstart=0.), start=event, end=10)
+    scenario = Scenario(start=0, end=10)
+    scenario.set_actors([actor])
+    scenario.set_activities([activity, triggered])
+    scenario.set_acts([(actor, activity), (actor, triggered)])
+    return scenario, triggered, event
+
+
+def test_equal_to_state_unknown_at_start():
+    """ The state is only known from the start of the activity at 5 seconds. """
+    category = ActivityCategory(Linear(), StateVariable.HEADING, name="heading")
+    scenario, _, event = _scenario(category, dict(xstart=0., xend=1.), 5,
+                                   dict(state_variable="HEADING", rule="equal_to", value=.8))
+    assert resolve_event(scenario, event) == pytest.approx(9., abs=1e-5)
+
+
+def test_equal_to_value_at_start():
+    """ The value is reached at the start, so the condition is met immediately. """
+    category = ActivityCategory(Constant(), StateVariable.HEADING, name="heading")
+    scenario, _, event = _scenario(category, dict(xstart=.8), 0,
+                                   dict(state_variable="HEADING", rule="equal_to", value=.8))
+    assert resolve_event(scenario, event) == pytest.approx(0.)
+
+
+def test_resolved_time_after_change_of_parameters():
+    """ After changing the parameters, the time needs to be resolved again. """
+    category = ActivityCategory(Linear(), StateVariable.HEADING, name="heading")
+    scenario, triggered, event = _scenario(category, dict(xstart=0., xend=1.), 0,
+                                           dict(state_variable="HEADING", rule="greater_than",
+                                                value=.5))
+    assert resolve_event(scenario, event) == pytest.approx(5., abs=1e-5)
+    assert triggered.get_tstart() == pytest.approx(5., abs=1e-5)
+
+    scenario.activities[0].parameters["xend"] = 2.
+    assert triggered.get_tstart() is None
+    assert resolve_event(scenario, event) == pytest.approx(2.5, abs=1e-5)
+    assert triggered.get_tstart() == pytest.approx(2.5, abs=1e-5)
+
+
+def test_event_that_depends_on_other_event():
+    """ The speed of the ego vehicle depends on the activity that starts with the first event. """
+    vehicle = ActorCategory(ActorType.Vehicle, name="vehicle")
+    ego = Actor(vehicle, initial_states=[State(StateVariable.LONGITUDINAL_POSITION, 0.)])
+    lead = Actor(vehicle, initial_states=[State(StateVariable.LONGITUDINAL_POSITION, 60.)])
+    constant = ActivityCategory(Constant(), StateVariable.SPEED, name="constant speed")
+    braking = Event(conditions=dict(state_condition=dict(
+        actor=lead.uid, relative_to=ego.uid, state_variable="LONGITUDINAL_POSITION",
+        rule="less_than", value=30)))
+    slow = Event(conditions=dict(state_condition=dict(actor=ego.uid, state_variable="SPEED",
+                                                      rule="equal_to", value=15)))
+    brake = Activity(ActivityCategory(Linear(), StateVariable.SPEED, name="braking"),
+                     dict(xstart=20., xend=10.), start=braking, end=10)
+    scenario = Scenario(start=0, end=10)
+    scenario.set_actors([ego, lead])
+    scenario.set_activities([Activity(constant, dict(xstart=20.), start=0, end=10),
+                             Activity(constant, dict(xstart=10.), start=0, end=10), brake,
+                             Activity(constant, dict(xstart=0.), start=slow, end=10)])
+    scenario.set_acts([(ego, scenario.activities[0]), (lead, scenario.activities[1]),
+                       (ego, brake), (lead, scenario.activities[3])])
+
+    # As long as the braking event is not resolved, the speed of the ego vehicle is constant.
+    assert resolve_event(scenario, slow) is None
+    assert resolve_events(scenario) == {braking.uid: pytest.approx(3., abs=1e-5),
+                                        slow.uid: pytest.approx(6.5, abs=1e-5)}
+    assert slow.get_time() == pytest.approx(6.5, abs=1e-5)
+
+    brake.parameters["xend"] = 0.
+    assert braking.get_time() is None and slow.get_time() is None
+    assert resolve_event(scenario, braking) == pytest.approx(3., abs=1e-5)
+    assert slow.get_time() is None
+    assert resolve_event(scenario, slow) == pytest.approx(4.75, abs=1e-5)
+
+    # An activity of the lead vehicle starts with the second event, so the first event needs to
+    # be resolved again.
+    assert braking.get_time() is None
+    assert resolve_events(scenario) == {braking.uid: pytest.approx(3., abs=1e-5),
+                                        slow.uid: pytest.approx(4.75, abs=1e-5)}
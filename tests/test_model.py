@@ -0,0 +1,57 @@
+""" Tests for the models
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+import numpy as np
+from scipy.interpolate import splev
+from domain_model import Constant, Linear, Sinusoidal, Spline3Knots, Splines
+from domain_model.model import MultiBSplines
+
+
+def test_batch_same_as_each_set_of_parameters():
+    """ Evaluating all sets of parameters at once gives the same result as one set at a time. """
+    rng = np.random.default_rng(0)
+    fit_time = np.linspace(0, 1, 50)
+    for model in (Constant(), Linear(), Sinusoidal(), Spline3Knots(), Splines(),
+                  MultiBSplines(2)):
+        data = np.cumsum(rng.normal(size=(20, 50)), axis=1)
+        if isinstance(model, MultiBSplines):
+            pars = [model.fit(fit_time, np.array([row, -row])) for row in data]
+        else:
+            pars = [model.fit(fit_time, row) for row in data]
+        time = rng.uniform(0, 1, (20, 30))
+        for batch, single in ((model.get_state_batch, model.get_state),
+                              (model.get_state_dot_batch, model.get_state_dot)):
+            expected = np.array([single(par, tdata) for par, tdata in zip(pars, time)])
+            np.testing.assert_allclose(batch(pars, time), expected, rtol=1e-10, atol=1e-10)
+            np.testing.assert_allclose(batch(pars, time[0]),
+                                       np.array([single(par, time[0]) for par in pars]),
+                                       rtol=1e-10, atol=1e-10)
+
+
+def test_batch_of_splines_with_different_knots():
+    """ Sets of parameters with different knots are evaluated separately. """
+    rng = np.random.default_rng(1)
+    fit_time = np.linspace(0, 1, 50)
+    pars = [Splines(n_knots=n_knots, degree=degree).fit(fit_time, rng.normal(size=50))
+            for n_knots, degree in ((3, 3), (5, 2), (3, 3), (4, 3), (5, 2))]
+    time = rng.uniform(0, 1, (len(pars), 30))
+    expected = np.array([splev(tdata, (par["knots"], par["coefficients"], par["degree"]))
+                         for par, tdata in zip(pars, time)])
+    np.testing.assert_allclose(Splines().get_state_batch(pars, time), expected, rtol=1e-10,
+                               atol=1e-10)
+
+
+def test_batch_with_array_of_parameters():
+    """ An array with a row for each set of parameters gives the same result as dictionaries. """
+    rng = np.random.default_rng(2)
+    time = np.linspace(0, 1, 30)
+    for model in (Constant(), Linear(), Sinusoidal(), Spline3Knots()):
+        array = rng.normal(size=(10, len(model.parameter_names)))
+        pars = [dict(zip(model.parameter_names, row)) for row in array]
+        np.testing.assert_allclose(model.get_state_batch(array, time),
+                                   model.get_state_batch(pars, time))
@@ -0,0 +1,58 @@
+""" Tests for the ResultCache class
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+import os
+from domain_model import Actor, ActorCategory, ActorType, ResultCache, Scenario, \
+    ScenarioCategory, Tag
+
+
+def test_results_after_change_of_tags(tmp_path):
+    """ Results are not used anymore after the tags change, but they are kept on disk. """
+    scenario_category = ScenarioCategory("", name="category", actor_categories=[
+        ActorCategory(ActorType.Vehicle, name="vehicle", tags=[Tag.RoadUserType_Vehicle])])
+    actor = Actor(ActorCategory(ActorType.Vehicle, name="car",
+                                tags=[Tag.RoadUserType_CategoryM_PassengerCar]), name="car")
+    scenario = Scenario(start=0, end=1, name="scenario")
+    scenario.set_actors([actor])
+
+    path = os.path.join(str(tmp_path), "results.sqlite")
+    with ResultCache(path) as cache:
+        assert cache.comprises(scenario_category, scenario)
+        assert cache.comprises(scenario_category, scenario)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        actor.category.tags = [Tag.RoadUserType_VRU_Pedestrian]
+        assert not cache.comprises(scenario_category, scenario)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    with ResultCache(path) as cache:
+        assert len(cache) == 2
+        assert not cache.comprises(scenario_category, scenario)
+        actor.category.tags = [Tag.RoadUserType_CategoryM_PassengerCar]
+        assert cache.comprises(scenario_category, scenario)
+        assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_least_recently_used_results_are_removed(tmp_path):
+    """ The times at which results are used are stored, also if they are written later. """
+    scenario_category = ScenarioCategory("", name="category", tags=[Tag.RoadUserType_Vehicle])
+    scenarios = [Scenario(start=0, end=1, name="scenario{:d}".format(i), tags=[tag])
+                 for i, tag in enumerate(Tag)]
+
+    path = os.path.join(str(tmp_path), "results.sqlite")
+    with ResultCache(path, max_entries=20) as cache:
+        for scenario in scenarios[:20]:
+            cache.comprises(scenario_category, scenario)
+        cache.comprises(scenario_category, scenarios[0])
+        for scenario in scenarios[20:25]:
+            cache.comprises(scenario_category, scenario)
+        assert len(cache) <= 20
+    with ResultCache(path, max_entries=20) as cache:
+        cache.comprises(scenario_category, scenarios[0])
+        cache.comprises(scenario_category, scenarios[1])
+        assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,95 @@
+""" Tests for the Scenario class
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from typing import List
+import numpy as np
+from domain_model import Activity, ActivityCategory, Actor, ActorCategory, ActorType, Constant, \
+    Linear, Scenario, StateVariable, Tag
+
+
+def _scenario() -> Scenario:
+    actor = Actor(ActorCategory(ActorType.Vehicle, name="vehicle",
+                                tags=[Tag.RoadUserType_Vehicle]), name="ego")
+    category = ActivityCategory(Constant(), StateVariable.SPEED, name="speed",
+                                tags=[Tag.VehicleLongitudinalActivity_DrivingForward])
+    activity = Activity(category, dict(xstart=10.), start=0, end=10)
+    scenario = Scenario(start=0, end=10)
+    scenario.set_actors([actor])
+    scenario.set_activities([activity])
+    scenario.set_acts([(actor, activity)])
+    return scenario
+
+
+def test_derived_tags_after_change_of_actor_category():
+    """ The derived tags are derived again if the category of an actor is replaced. """
+    scenario = _scenario()
+    assert Tag.RoadUserType_Vehicle in scenario.derived_tags()["ego::Actor"]
+
+    scenario.actors[0].category = ActorCategory(ActorType.VRU_Pedestrian, name="pedestrian",
+                                                tags=[Tag.RoadUserType_VRU_Pedestrian])
+    tags = scenario.derived_tags()["ego::Actor"]
+    assert Tag.RoadUserType_Vehicle not in tags
+    assert Tag.RoadUserType_VRU_Pedestrian in tags
+
+    # The tags of the new category are observed as well.
+    scenario.actors[0].category.tags.append(Tag.EgoVehicle)
+    assert Tag.EgoVehicle in scenario.derived_tags()["ego::Actor"]
+
+
+def test_derived_tags_after_change_of_activity_category():
+    """ The derived tags are derived again if the category of an activity is replaced. """
+    scenario = _scenario()
+    assert Tag.VehicleLongitudinalActivity_DrivingForward in \
+        scenario.derived_tags()["ego::Actor"]
+
+    scenario.activities[0].category = ActivityCategory(
+        Constant(), StateVariable.SPEED, name="standing still",
+        tags=[Tag.VehicleLongitudinalActivity_StandingStill])
+    tags = scenario.derived_tags()["ego::Actor"]
+    assert Tag.VehicleLongitudinalActivity_DrivingForward not in tags
+    assert Tag.VehicleLongitudinalActivity_StandingStill in tags
+
+
+def _naive_state(activities: List[Activity], time: np.ndarray) -> np.ndarray:
+    """ Use, for each time instant, the last activity that covers that time instant. """
+    values = np.full(len(time), np.nan)
+    for i, instant in enumerate(time):
+        for activity in activities:
+            if activity.get_tstart() <= instant <= activity.get_tend():
+                values[i] = activity.get_state(time=[instant])[0]
+    return values
+
+
+def _scenario_with_intervals(tstart: np.ndarray, tend: np.ndarray) -> Scenario:
+    actor = Actor(ActorCategory(ActorType.Vehicle, name="vehicle"), name="ego")
+    category = ActivityCategory(Linear(), StateVariable.SPEED, name="speed")
+    activities = [Activity(category, dict(xstart=float(i), xend=i + .5), start=float(start),
+                           end=float(end)) for i, (start, end) in enumerate(zip(tstart, tend))]
+    scenario = Scenario(start=0, end=20)
+    scenario.set_actors([actor])
+    scenario.set_activities(activities)
+    scenario.set_acts([(actor, activity) for activity in activities])
+    return scenario
+
+
+def test_state_of_sorted_and_unsorted_activities():
+    """ The binary search for sorted activities gives the same result as checking each activity. """
+    rng = np.random.default_rng(0)
+    time = np.concatenate((np.linspace(-1, 21, 221), rng.uniform(-1, 21, 100)))
+    for _ in range(10):
+        # Sorted activities that follow each other, with gaps and overlaps.
+        tstart = np.sort(rng.uniform(0, 18, 8))
+        tend = np.sort(tstart + rng.uniform(0, 3, 8))
+        # Activities in random order.
+        other_tstart = rng.uniform(0, 18, 8)
+        other_tend = other_tstart + rng.uniform(0, 5, 8)
+        for start, end in ((tstart, tend), (other_tstart, other_tend)):
+            scenario = _scenario_with_intervals(start, end)
+            np.testing.assert_array_equal(
+                scenario.get_state(scenario.actors[0], StateVariable.SPEED, time),
+                _naive_state(scenario.activities, time))
@@ -0,0 +1,29 @@
+""" Tests for the ScenarioCategory class
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+from itertools import permutations
+import random
+from typing import List
+from domain_model.scenario_category import _has_complete_matching
+
+
+def _brute_force(adjacency: List[int], n_right: int) -> bool:
+    return any(all(bitset >> j & 1 for bitset, j in zip(adjacency, right))
+               for right in permutations(range(n_right), len(adjacency)))
+
+
+def test_complete_matching_brute_force():
+    """ The Hopcroft-Karp algorithm gives the same result as trying all assignments. """
+    rng = random.Random(0)
+    for _ in range(2000):
+        n_left, n_right = rng.randint(0, 6), rng.randint(0, 6)
+        density = rng.random()
+        adjacency = [sum(1 << j for j in range(n_right) if rng.random() < density)
+                     for _ in range(n_left)]
+        assert _has_complete_matching(adjacency, n_right) == _brute_force(adjacency, n_right), \
+            (adjacency, n_right)
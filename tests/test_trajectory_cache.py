@@ -0,0 +1,33 @@
+""" Tests for the TrajectoryCache class
+
+Creation date: 2026 10 16
+Author(s): agent
+
+Modifications:
+"""
+
+import numpy as np
+from domain_model import TrajectoryCache
+
+
+def test_results_without_array_are_removed():
+    """ Results such as None count as well, so the number of stored results is bounded. """
+    cache = TrajectoryCache(max_bytes=10000)
+    for i in range(1000):
+        assert cache.get(i, lambda: None) is None
+    assert 0 < len(cache) < 100
+    assert cache.n_bytes <= cache.max_bytes
+    assert cache.get(999, lambda: 1) is None
+
+
+def test_lower_max_bytes():
+    """ Lowering the maximum size removes the results that are least recently used. """
+    cache = TrajectoryCache()
+    for i in range(10):
+        cache.get(i, lambda: np.zeros(100))
+    cache.get(0, lambda: np.ones(100))
+    cache.max_bytes = cache.n_bytes // 2
+    assert cache.n_bytes <= cache.max_bytes
+    assert 0 < len(cache) < 10
+    assert np.all(cache.get(0, lambda: np.ones(100)) == 0)
+    assert cache.statistics()["n_entries"] == len(cache)